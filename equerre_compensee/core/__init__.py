@@ -0,0 +1,39 @@
+#! python3  # noqa: E265
+
+"""Compensation math, free of any QGIS or Qt dependency, usable from plain
+Python processes like batch services, benchmarks and tests.
+"""
+
+from equerre_compensee.core.baseline_search import (  # noqa: F401
+    BaselineCandidate,
+    GridIndex,
+    find_baselines,
+)
+from equerre_compensee.core.compensation import (  # noqa: F401
+    read_distances,
+    square_point,
+    square_points,
+)
+from equerre_compensee.core.dependencies import (  # noqa: F401
+    DependencyIndex,
+    PointInputs,
+)
+from equerre_compensee.core.error_statistics import (  # noqa: F401
+    ErrorStatistics,
+    RunningStatistics,
+)
+from equerre_compensee.core.scale_grid import (  # noqa: F401
+    ScaleGrid,
+    elevation_factor,
+)
+from equerre_compensee.core.tolerance import (  # noqa: F401
+    DEFAULT_TOLERANCE_MODEL,
+    FormulaModel,
+    TableModel,
+    ToleranceModel,
+    register_tolerance_model,
+    tolerance_model,
+    tolerance_models,
+    tolerance_threshold,
+)
+from equerre_compensee.core.traverse import Traverse  # noqa: F401
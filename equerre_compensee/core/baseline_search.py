@@ -0,0 +1,110 @@
+#! python3  # noqa: E265
+
+# standard
+import math
+from collections import defaultdict
+from typing import Iterable, List, NamedTuple, Tuple
+
+Point = Tuple[float, float]
+
+
+class BaselineCandidate(NamedTuple):
+    """A vertex pair whose separation matches a measured distance"""
+
+    start: Point
+    end: Point
+    length: float
+    error: float
+    score: float
+
+
+class GridIndex:
+    """A uniform grid over points, for fixed-radius neighbour queries.
+
+    With a cell size close to the query radius, a query only visits the
+    few cells around its center instead of every point.
+    """
+
+    def __init__(self, points: Iterable[Point], cell_size: float):
+        """
+        :param points: (x, y) tuples
+        :param cell_size: size of the grid cells
+        """
+        if cell_size <= 0:
+            raise ValueError("The cell size must be positive")
+
+        self.points = list(points)
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        for index, (x, y) in enumerate(self.points):
+            self.cells[self._cell(x, y)].append(index)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def within(
+        self, center: Point, radius: float, min_radius: float = 0
+    ) -> List[Tuple[int, float]]:
+        """Returns the (index, distance) of the points in a ring
+        :param center: the ring center
+        :param radius: the ring outer radius
+        :param min_radius: the ring inner radius
+        """
+        x, y = center
+        col_min, row_min = self._cell(x - radius, y - radius)
+        col_max, row_max = self._cell(x + radius, y + radius)
+        squared_radius = radius * radius
+        squared_min_radius = min_radius * min_radius if min_radius > 0 else -1
+        neighbours = []
+        for col in range(col_min, col_max + 1):
+            for row in range(row_min, row_max + 1):
+                for index in self.cells.get((col, row), ()):
+                    point_x, point_y = self.points[index]
+                    squared = (point_x - x) ** 2 + (point_y - y) ** 2
+                    if squared_min_radius <= squared <= squared_radius:
+                        neighbours.append((index, math.sqrt(squared)))
+        return neighbours
+
+
+def find_baselines(
+    index: GridIndex,
+    cursor: Point,
+    radius: float,
+    distance: float,
+    tolerance: float,
+    limit: int = 5,
+) -> List[BaselineCandidate]:
+    """Returns the vertex pairs starting near the cursor whose separation
+    is within the tolerance of the distance, best first. A candidate is
+    ranked on its error relative to the tolerance and on the distance of
+    its start to the cursor relative to the search radius
+    :param index: a grid index of the vertices, ideally with a cell size
+        of the distance plus the tolerance
+    :param cursor: the cursor location
+    :param radius: the search radius of the start vertices around the cursor
+    :param distance: the measured distance
+    :param tolerance: the tolerated error
+    :param limit: maximum number of candidates
+    """
+    if distance <= 0 or radius <= 0:
+        return []
+
+    tolerance = max(tolerance, 0)
+    candidates = []
+    for start_index, cursor_distance in index.within(cursor, radius):
+        start = index.points[start_index]
+        for end_index, length in index.within(
+            start, distance + tolerance, distance - tolerance
+        ):
+            if end_index == start_index:
+                continue
+            error = abs(length - distance)
+            score = (error / tolerance if tolerance else 0) + cursor_distance / radius
+            candidates.append(
+                BaselineCandidate(start, index.points[end_index], length, error, score)
+            )
+    candidates.sort(key=lambda candidate: candidate.score)
+    return candidates[:limit]
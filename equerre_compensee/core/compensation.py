@@ -0,0 +1,98 @@
+#! python3  # noqa: E265
+
+# standard
+import csv
+import math
+from typing import Iterable, List, Tuple
+
+Point = Tuple[float, float]
+
+
+def square_point(
+    start: Point,
+    end: Point,
+    distance_one: float,
+    distance_two: float = 0,
+    distance_measured: float = 0,
+) -> Point:
+    """Returns a point from a baseline, with a compensated abscissa
+    and an ordinate
+    :param start: the baseline first vertex
+    :param end: the baseline second vertex
+    :param distance_one: the abscissa measured along the baseline
+    :param distance_two: the ordinate, positive on the left hand side
+    :param distance_measured: the baseline length measured on the plan,
+        used to compensate the abscissa. Not compensated if 0
+    """
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length = math.hypot(dx, dy)
+    if length == 0:
+        raise ValueError("The baseline vertices are the same")
+
+    ux, uy = dx / length, dy / length
+    if distance_measured:
+        distance_one *= length / distance_measured
+    # second distance isn't compensated
+    return (
+        start[0] + distance_one * ux - distance_two * uy,
+        start[1] + distance_one * uy + distance_two * ux,
+    )
+
+
+def square_points(
+    start: Point,
+    end: Point,
+    distances: Iterable[Tuple[float, float]],
+    distance_measured: float = 0,
+) -> List[Point]:
+    """Returns the points of abscissas and ordinates from a baseline
+    :param start: the baseline first vertex
+    :param end: the baseline second vertex
+    :param distances: (abscissa, ordinate) tuples
+    :param distance_measured: the baseline length measured on the plan
+    """
+    return [
+        square_point(start, end, distance_one, distance_two, distance_measured)
+        for distance_one, distance_two in distances
+    ]
+
+
+def read_distances(
+    lines: Iterable[str], skipped: List[int] = None
+) -> List[Tuple[float, float]]:
+    """Reads (abscissa, ordinate) tuples from delimited text lines,
+    separated by a semicolon or a tab if any line has one, else by a comma.
+    With a semicolon or a tab, decimal commas are allowed. A first row
+    without numbers is a header, a missing ordinate is 0 and the other rows
+    that can't be read are skipped
+    :param lines: delimited text lines
+    :param skipped: a list to append the numbers of the skipped lines to,
+        counted from 1
+    """
+    rows = [(number, line) for number, line in enumerate(lines, 1) if line.strip()]
+    if not rows:
+        return []
+
+    if any(";" in line for _, line in rows):
+        delimiter = ";"
+    elif any("\t" in line for _, line in rows):
+        delimiter = "\t"
+    else:
+        delimiter = ","
+    distances = []
+    for (number, _), row in zip(
+        rows, csv.reader((line for _, line in rows), delimiter=delimiter)
+    ):
+        values = [value.strip() for value in row if value.strip()]
+        if delimiter != ",":
+            # decimal comma
+            values = [value.replace(",", ".") for value in values]
+        try:
+            numbers = [float(value) for value in values[:2]]
+        except ValueError:
+            numbers = []
+        if numbers:
+            distances.append((numbers[0], numbers[1] if len(numbers) > 1 else 0.0))
+        elif number != rows[0][0] and skipped is not None:
+            skipped.append(number)
+    return distances
@@ -0,0 +1,109 @@
+#! python3  # noqa: E265
+
+# standard
+from collections import defaultdict
+from typing import Dict, NamedTuple, Sequence, Tuple
+
+from equerre_compensee.core.traverse import Traverse
+
+Point = Tuple[float, float]
+
+
+class PointInputs(NamedTuple):
+    """The inputs a point was computed from"""
+
+    baseline_id: int
+    distance_one: float
+    distance_two: float
+    distance_measured: float
+    scale_factor: float = 1.0
+
+
+class DependencyIndex:
+    """An index from the baselines to the points computed from them.
+
+    When a baseline is edited, only its dependent points are recomputed.
+    """
+
+    def __init__(self):
+        self._inputs = {}
+        self._dependents = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._inputs)
+
+    def __contains__(self, point_id: int) -> bool:
+        return point_id in self._inputs
+
+    def add(
+        self,
+        point_id: int,
+        baseline_id: int,
+        distance_one: float,
+        distance_two: float = 0,
+        distance_measured: float = 0,
+        scale_factor: float = 1.0,
+    ) -> None:
+        """Adds a point, replacing its previous inputs
+        :param point_id: the point identifier
+        :param baseline_id: the baseline identifier
+        :param distance_one: the abscissa or chainage
+        :param distance_two: the ordinate or offset
+        :param distance_measured: the baseline length measured on the plan
+        :param scale_factor: the ground to grid factor applied to the distances
+        """
+        self.remove(point_id)
+        self._inputs[point_id] = PointInputs(
+            baseline_id, distance_one, distance_two, distance_measured, scale_factor
+        )
+        self._dependents[baseline_id].add(point_id)
+
+    def remove(self, point_id: int) -> None:
+        """Removes a point
+        :param point_id: the point identifier
+        """
+        inputs = self._inputs.pop(point_id, None)
+        if inputs is None:
+            return
+
+        dependents = self._dependents[inputs.baseline_id]
+        dependents.discard(point_id)
+        if not dependents:
+            del self._dependents[inputs.baseline_id]
+
+    def remove_baseline(self, baseline_id: int) -> None:
+        """Removes a baseline and the dependencies of its points
+        :param baseline_id: the baseline identifier
+        """
+        for point_id in self._dependents.pop(baseline_id, ()):
+            del self._inputs[point_id]
+
+    def dependents(self, baseline_id: int) -> Dict[int, PointInputs]:
+        """Returns the inputs of the points computed from a baseline
+        :param baseline_id: the baseline identifier
+        """
+        return {
+            point_id: self._inputs[point_id]
+            for point_id in self._dependents.get(baseline_id, ())
+        }
+
+    def recompute(
+        self, baseline_id: int, vertices: Sequence[Point]
+    ) -> Dict[int, Point]:
+        """Returns the new locations of the points of an edited baseline
+        :param baseline_id: the baseline identifier
+        :param vertices: the new baseline vertices
+        """
+        dependents = self.dependents(baseline_id)
+        if not dependents:
+            return {}
+
+        traverse = Traverse(vertices)
+        return {
+            point_id: traverse.point_at(
+                inputs.distance_one * inputs.scale_factor,
+                inputs.distance_two * inputs.scale_factor,
+                inputs.distance_measured * inputs.scale_factor,
+            )
+            for point_id, inputs in dependents.items()
+        }
@@ -0,0 +1,161 @@
+#! python3  # noqa: E265
+
+# standard
+import math
+from typing import Dict, Hashable, Union
+
+
+class RunningStatistics:
+    """Count, mean and variance of a stream of values, in constant memory,
+    with Welford's algorithm. Weighted values and merges use Chan's
+    parallel formula.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """Adds a value, repeated weight times
+        :param value: a value
+        :param weight: the number of repetitions
+        """
+        if weight <= 0:
+            return
+
+        count = self.count + weight
+        delta = value - self.mean
+        self.mean += delta * weight / count
+        self._m2 += delta * delta * self.count * weight / count
+        self.count = count
+
+    def merge(self, other: "RunningStatistics") -> None:
+        """Merges the values of another stream
+        :param other: another stream statistics
+        """
+        if other.count == 0:
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """Returns the sample variance, 0 with less than two values"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Returns the sample standard deviation"""
+        return math.sqrt(self.variance)
+
+
+class ErrorStatistics:
+    """Statistics of the differences between computed and measured distances.
+
+    Created points add the measurement of their baseline, counted once
+    however many points are created from it in a row: a baseline is a
+    single observation. Only the last measurement is remembered, the
+    memory stays constant. Besides the error statistics, the ratios of computed to
+    measured distances are followed to detect a systematic scale drift,
+    the sign of a wrong plan scale.
+    """
+
+    def __init__(self):
+        self.errors = RunningStatistics()
+        self.ratios = RunningStatistics()
+        self.max_error = 0.0
+        self.out_of_tolerance = 0
+        self.points = 0
+        self._last_key = None
+
+    @property
+    def count(self) -> int:
+        """Returns the number of distinct measurements"""
+        return self.errors.count
+
+    def add(
+        self,
+        measured: float,
+        computed: float,
+        tolerance: float,
+        weight: int = 1,
+        key: Hashable = None,
+    ) -> None:
+        """Adds the points created from a measurement, the measurement only
+        if its key differs from the last added one
+        :param measured: the distance measured on the plan
+        :param computed: the computed distance
+        :param tolerance: the tolerated error
+        :param weight: the number of points created from this measurement
+        :param key: the measurement identifier, like its baseline id,
+            None for a measurement added once only
+        """
+        if measured <= 0 or weight <= 0:
+            return
+
+        self.points += weight
+        if key is not None and key == self._last_key:
+            return
+        self._last_key = key
+
+        error = computed - measured
+        self.errors.add(error)
+        self.ratios.add(computed / measured)
+        self.max_error = max(self.max_error, abs(error))
+        if abs(error) > tolerance:
+            self.out_of_tolerance += 1
+
+    def merge(self, other: "ErrorStatistics") -> None:
+        """Merges the measurements of other statistics, which must not share
+        any measurement with these ones
+        :param other: other error statistics
+        """
+        self.errors.merge(other.errors)
+        self.ratios.merge(other.ratios)
+        self.max_error = max(self.max_error, other.max_error)
+        self.out_of_tolerance += other.out_of_tolerance
+        self.points += other.points
+        self._last_key = other._last_key
+
+    @property
+    def out_of_tolerance_share(self) -> float:
+        """Returns the share of measurements out of tolerance"""
+        return self.out_of_tolerance / self.count if self.count else 0.0
+
+    @property
+    def scale_drift(self) -> float:
+        """Returns the mean relative scale difference, computed / measured - 1"""
+        return self.ratios.mean - 1 if self.count else 0.0
+
+    def drift_suspected(
+        self, threshold: float = 0.001, z_score: float = 3, min_count: int = 5
+    ) -> bool:
+        """Returns True if the scale drift is systematic: larger than the
+        threshold and significantly different from 0
+        :param threshold: the minimum relative scale difference
+        :param z_score: the number of standard errors of the mean ratio
+        :param min_count: the minimum number of measurements
+        """
+        if self.count < min_count or abs(self.scale_drift) <= threshold:
+            return False
+        standard_error = self.ratios.std / math.sqrt(self.count)
+        return abs(self.scale_drift) > z_score * standard_error
+
+    def to_dict(self) -> Dict[str, Union[int, float, bool]]:
+        """Returns the statistics, for an export"""
+        return {
+            "points": self.points,
+            "count": self.count,
+            "mean": self.errors.mean,
+            "std": self.errors.std,
+            "max": self.max_error,
+            "out_of_tolerance": self.out_of_tolerance,
+            "out_of_tolerance_share": self.out_of_tolerance_share,
+            "scale_drift": self.scale_drift,
+            "drift_suspected": self.drift_suspected(),
+        }
@@ -0,0 +1,130 @@
+#! python3  # noqa: E265
+
+# standard
+import math
+from typing import Callable, List
+
+EARTH_RADIUS = 6378137.0
+
+
+def elevation_factor(elevation: float, radius: float = EARTH_RADIUS) -> float:
+    """Returns the reduction factor of a ground distance to the ellipsoid
+    :param elevation: the ellipsoidal height of the working area, in meters
+    :param radius: the mean radius of the Earth in the working area
+    """
+    return radius / (radius + elevation)
+
+
+class ScaleGrid:
+    """Projection scale factors precomputed on the nodes of a regular grid,
+    bilinearly interpolated in between. A lookup is a few arithmetic
+    operations, instead of a projection computation.
+    """
+
+    def __init__(
+        self, x_min: float, y_min: float, step: float, values: List[List[float]]
+    ):
+        """
+        :param x_min: abscissa of the first column
+        :param y_min: ordinate of the first row
+        :param step: spacing of the nodes
+        :param values: the scale factors, by rows from y_min, by columns from x_min
+        """
+        if step <= 0:
+            raise ValueError("The grid step must be positive")
+        if len(values) < 2 or len(values[0]) < 2:
+            raise ValueError("A grid needs at least two rows and two columns")
+
+        self.x_min = x_min
+        self.y_min = y_min
+        self.step = step
+        self.values = values
+        self.rows = len(values)
+        self.cols = len(values[0])
+        self.x_max = x_min + (self.cols - 1) * step
+        self.y_max = y_min + (self.rows - 1) * step
+
+    @classmethod
+    def build(
+        cls,
+        x_min: float,
+        y_min: float,
+        x_max: float,
+        y_max: float,
+        step: float,
+        scale_factor: Callable[[float, float], float],
+    ) -> "ScaleGrid":
+        """Returns a grid covering an extent, with nodes on multiples of the step
+        :param x_min: the extent minimum abscissa
+        :param y_min: the extent minimum ordinate
+        :param x_max: the extent maximum abscissa
+        :param y_max: the extent maximum ordinate
+        :param step: spacing of the nodes
+        :param scale_factor: a function returning the scale factor at (x, y)
+        """
+        x_start = math.floor(x_min / step) * step
+        y_start = math.floor(y_min / step) * step
+        cols = max(2, math.ceil((x_max - x_start) / step) + 1)
+        rows = max(2, math.ceil((y_max - y_start) / step) + 1)
+        values = [
+            [
+                scale_factor(x_start + col * step, y_start + row * step)
+                for col in range(cols)
+            ]
+            for row in range(rows)
+        ]
+        return cls(x_start, y_start, step, values)
+
+    def contains(
+        self, x_min: float, y_min: float, x_max: float, y_max: float
+    ) -> bool:
+        """Returns True if the grid covers an extent
+        :param x_min: the extent minimum abscissa
+        :param y_min: the extent minimum ordinate
+        :param x_max: the extent maximum abscissa
+        :param y_max: the extent maximum ordinate
+        """
+        return (
+            self.x_min <= x_min
+            and self.y_min <= y_min
+            and x_max <= self.x_max
+            and y_max <= self.y_max
+        )
+
+    def factor(self, x: float, y: float) -> float:
+        """Returns the scale factor at a location, clamped to the grid edges
+        :param x: the abscissa
+        :param y: the ordinate
+        """
+        col = min(max((x - self.x_min) / self.step, 0), self.cols - 1)
+        row = min(max((y - self.y_min) / self.step, 0), self.rows - 1)
+        col_index = min(int(col), self.cols - 2)
+        row_index = min(int(row), self.rows - 2)
+        dx, dy = col - col_index, row - row_index
+        bottom = self.values[row_index]
+        top = self.values[row_index + 1]
+        return (1 - dy) * (
+            (1 - dx) * bottom[col_index] + dx * bottom[col_index + 1]
+        ) + dy * ((1 - dx) * top[col_index] + dx * top[col_index + 1])
+
+    def ground_to_grid(
+        self, distance: float, x: float, y: float, elevation: float = 0
+    ) -> float:
+        """Returns the grid distance of a ground distance
+        :param distance: a ground distance
+        :param x: the abscissa of the distance midpoint
+        :param y: the ordinate of the distance midpoint
+        :param elevation: the ellipsoidal height of the ground
+        """
+        return distance * self.factor(x, y) * elevation_factor(elevation)
+
+    def grid_to_ground(
+        self, distance: float, x: float, y: float, elevation: float = 0
+    ) -> float:
+        """Returns the ground distance of a grid distance
+        :param distance: a grid distance
+        :param x: the abscissa of the distance midpoint
+        :param y: the ordinate of the distance midpoint
+        :param elevation: the ellipsoidal height of the ground
+        """
+        return distance / (self.factor(x, y) * elevation_factor(elevation))
@@ -0,0 +1,220 @@
+#! python3  # noqa: E265
+
+# standard
+import csv
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Sequence
+
+DEFAULT_TOLERANCE_MODEL = "ems"
+
+
+def _numpy():
+    """Returns numpy if available, imported on first use only to keep the
+    import of the core package fast
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class ToleranceModel(ABC):
+    """A tolerance model, returning the tolerated error of a distance.
+
+    Models are evaluated on a single distance by calling them, or on many
+    distances at once with ``evaluate``, vectorized when numpy is available.
+    Subclasses must implement ``__call__``.
+    """
+
+    def __init__(self, name: str, label: str):
+        """
+        :param name: the model identifier, in the registry
+        :param label: the model label, shown to the users
+        """
+        self.name = name
+        self.label = label
+
+    @abstractmethod
+    def __call__(self, distance: float) -> float:
+        """Returns the tolerance of a distance
+        :param distance: a cartesian distance
+        """
+
+    def evaluate(self, distances: Sequence[float]):
+        """Returns the tolerances of distances, as a numpy array if numpy is
+        available, else as a list
+        :param distances: cartesian distances
+        """
+        np = _numpy()
+        if np is not None:
+            return np.fromiter(
+                map(self, np.asarray(distances, dtype=float).tolist()), dtype=float
+            )
+        return [self(distance) for distance in distances]
+
+    def within(self, measured: Sequence[float], computed: Sequence[float]):
+        """Returns if the computed distances are within the tolerance of the
+        measured ones, as a numpy array if numpy is available, else as a list
+        :param measured: the distances measured on the plan
+        :param computed: the computed distances
+        """
+        np = _numpy()
+        if np is not None:
+            measured = np.asarray(measured, dtype=float)
+            computed = np.asarray(computed, dtype=float)
+            return np.abs(measured - computed) <= self.evaluate(measured)
+        return [
+            abs(measured_distance - computed_distance) <= tolerance
+            for measured_distance, computed_distance, tolerance in zip(
+                measured, computed, self.evaluate(measured)
+            )
+        ]
+
+
+class FormulaModel(ToleranceModel):
+    """A tolerance of the form a·√d + b·d + c"""
+
+    def __init__(self, name: str, label: str, a: float, b: float, c: float):
+        """
+        :param name: the model identifier, in the registry
+        :param label: the model label, shown to the users
+        :param a: the coefficient of the distance square root
+        :param b: the coefficient of the distance
+        :param c: the constant
+        """
+        super().__init__(name, label)
+        self.a = a
+        self.b = b
+        self.c = c
+
+    def __call__(self, distance: float) -> float:
+        return self.a * distance**0.5 + self.b * distance + self.c
+
+    def evaluate(self, distances: Sequence[float]):
+        np = _numpy()
+        if np is None:
+            return super().evaluate(distances)
+        distances = np.asarray(distances, dtype=float)
+        return self.a * np.sqrt(distances) + self.b * distances + self.c
+
+
+class TableModel(ToleranceModel):
+    """A tolerance linearly interpolated in a table of (distance, tolerance),
+    constant beyond the first and the last distances. The slopes are
+    precomputed, so a lookup is a binary search and a multiplication.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        distances: Sequence[float],
+        tolerances: Sequence[float],
+    ):
+        """
+        :param name: the model identifier, in the registry
+        :param label: the model label, shown to the users
+        :param distances: the table distances, increasing
+        :param tolerances: the tolerances of the table distances
+        """
+        super().__init__(name, label)
+        if not distances or len(distances) != len(tolerances):
+            raise ValueError("A table needs as many tolerances as distances")
+        if any(d1 >= d2 for d1, d2 in zip(distances, distances[1:])):
+            raise ValueError("The table distances must be increasing")
+
+        self.distances = [float(distance) for distance in distances]
+        self.tolerances = [float(tolerance) for tolerance in tolerances]
+        self._slopes = [
+            (t2 - t1) / (d2 - d1)
+            for (d1, t1), (d2, t2) in zip(
+                zip(self.distances, self.tolerances),
+                zip(self.distances[1:], self.tolerances[1:]),
+            )
+        ]
+        self._arrays = None
+
+    @classmethod
+    def from_lines(cls, name: str, label: str, lines: Iterable[str]) -> "TableModel":
+        """Returns a table model read from delimited text lines of
+        distance;tolerance, rows without numbers are skipped
+        :param name: the model identifier, in the registry
+        :param label: the model label, shown to the users
+        :param lines: delimited text lines
+        """
+        rows = []
+        for row in csv.reader(
+            (line.replace("\t", ";") for line in lines if line.strip()), delimiter=";"
+        ):
+            try:
+                distance, tolerance = (
+                    float(value.replace(",", ".")) for value in row[:2]
+                )
+            except ValueError:
+                continue
+            rows.append((distance, tolerance))
+        rows.sort()
+        return cls(name, label, [row[0] for row in rows], [row[1] for row in rows])
+
+    def __call__(self, distance: float) -> float:
+        if distance <= self.distances[0]:
+            return self.tolerances[0]
+        if distance >= self.distances[-1]:
+            return self.tolerances[-1]
+        index = bisect_right(self.distances, distance) - 1
+        return self.tolerances[index] + self._slopes[index] * (
+            distance - self.distances[index]
+        )
+
+    def evaluate(self, distances: Sequence[float]):
+        np = _numpy()
+        if np is None:
+            return super().evaluate(distances)
+        if self._arrays is None:
+            self._arrays = (np.asarray(self.distances), np.asarray(self.tolerances))
+        return np.interp(np.asarray(distances, dtype=float), *self._arrays)
+
+
+TOLERANCE_MODELS: Dict[str, ToleranceModel] = {}
+
+
+def register_tolerance_model(model: ToleranceModel) -> None:
+    """Registers a tolerance model, replacing any model of the same name
+    :param model: a tolerance model
+    """
+    TOLERANCE_MODELS[model.name] = model
+
+
+def tolerance_model(name: str = DEFAULT_TOLERANCE_MODEL) -> ToleranceModel:
+    """Returns a registered tolerance model
+    :param name: the model identifier
+    """
+    try:
+        return TOLERANCE_MODELS[name]
+    except KeyError:
+        raise KeyError(f"Unknown tolerance model: {name}") from None
+
+
+def tolerance_models() -> List[ToleranceModel]:
+    """Returns the registered tolerance models"""
+    return list(TOLERANCE_MODELS.values())
+
+
+register_tolerance_model(
+    FormulaModel(
+        DEFAULT_TOLERANCE_MODEL,
+        "Eurométropole (0,014·√d + 0,0001·d + 0,03)",
+        0.014,
+        0.0001,
+        0.03,
+    )
+)
+
+
+def tolerance_threshold(distance: float) -> float:
+    """Returns a tolerance from a distance, with the default model
+    :param distance: a cartesian distance
+    """
+    return TOLERANCE_MODELS[DEFAULT_TOLERANCE_MODEL](distance)
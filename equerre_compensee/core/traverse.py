@@ -0,0 +1,122 @@
+#! python3  # noqa: E265
+
+# standard
+import math
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+
+class Traverse:
+    """A multi-segment traverse, compensated along its chainage.
+
+    The cumulative lengths of the segments are computed once, so that the
+    segment of a chainage is found by binary search.
+    """
+
+    def __init__(self, vertices: Sequence[Point]):
+        """
+        :param vertices: the traverse vertices, as (x, y) tuples
+        """
+        vertices = [(float(x), float(y)) for x, y in vertices]
+        # duplicated consecutive vertices would give zero length segments
+        self.vertices = [
+            vertex
+            for index, vertex in enumerate(vertices)
+            if index == 0 or vertex != vertices[index - 1]
+        ]
+        if len(self.vertices) < 2:
+            raise ValueError("A traverse needs at least two distinct vertices")
+
+        self._segments = [
+            (x2 - x1, y2 - y1, math.hypot(x2 - x1, y2 - y1))
+            for (x1, y1), (x2, y2) in zip(self.vertices, self.vertices[1:])
+        ]
+        self.chainages = [0.0] + list(
+            accumulate(length for _, _, length in self._segments)
+        )
+
+    @property
+    def length(self) -> float:
+        """Returns the total length of the traverse"""
+        return self.chainages[-1]
+
+    def reversed(self) -> "Traverse":
+        """Returns the same traverse, from its last vertex"""
+        return Traverse(self.vertices[::-1])
+
+    @property
+    def is_closed(self) -> bool:
+        """Returns True if the traverse is a ring"""
+        return len(self.vertices) > 2 and self.vertices[0] == self.vertices[-1]
+
+    def nearest_vertex(self, point: Point) -> int:
+        """Returns the index of the vertex nearest to a point
+        :param point: a (x, y) tuple
+        """
+        x, y = point
+        return min(
+            range(len(self.vertices)),
+            key=lambda index: math.hypot(
+                self.vertices[index][0] - x, self.vertices[index][1] - y
+            ),
+        )
+
+    def rotated(self, index: int) -> "Traverse":
+        """Returns the same ring, starting from one of its vertices
+        :param index: the index of the new first vertex
+        """
+        if not self.is_closed:
+            raise ValueError("Only a closed traverse can be rotated")
+
+        ring = self.vertices[:-1]
+        index %= len(ring)
+        return Traverse(ring[index:] + ring[: index + 1])
+
+    def segment_index(self, chainage: float) -> int:
+        """Returns the index of the segment containing a chainage,
+        chainages outside the traverse extend the first or last segment
+        :param chainage: a chainage along the traverse
+        """
+        index = bisect_right(self.chainages, chainage) - 1
+        return min(max(index, 0), len(self._segments) - 1)
+
+    def point_at(
+        self, chainage: float, offset: float = 0, measured_length: float = 0
+    ) -> Point:
+        """Returns the point at a chainage and a perpendicular offset
+        :param chainage: a chainage measured along the traverse
+        :param offset: a perpendicular offset, positive on the left hand side
+        :param measured_length: the total length measured on the plan, used to
+            compensate the chainage. Not compensated if 0
+        """
+        if measured_length:
+            chainage *= self.length / measured_length
+        index = self.segment_index(chainage)
+        dx, dy, length = self._segments[index]
+        ux, uy = dx / length, dy / length
+        along = chainage - self.chainages[index]
+        x, y = self.vertices[index]
+        # offsets aren't compensated
+        return (
+            x + along * ux - offset * uy,
+            y + along * uy + offset * ux,
+        )
+
+    def points_at(
+        self,
+        chainages: Iterable[float],
+        offsets: Iterable[float],
+        measured_length: float = 0,
+    ) -> List[Point]:
+        """Returns the points at chainages and perpendicular offsets
+        :param chainages: chainages measured along the traverse
+        :param offsets: perpendicular offsets, positive on the left hand side
+        :param measured_length: the total length measured on the plan
+        """
+        return [
+            self.point_at(chainage, offset, measured_length)
+            for chainage, offset in zip(chainages, offsets)
+        ]
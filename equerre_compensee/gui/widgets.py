@@ -1,37 +1,98 @@
 #! python3  # noqa: E265
 
 # standard
+import csv
 import math
 import os
-from typing import Union
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, List, Tuple, Union
 
 import equerre_compensee
-from equerre_compensee.utils import tolerance_threshold, xpm_cursor
+from equerre_compensee.core.baseline_search import (
+    BaselineCandidate,
+    GridIndex,
+    find_baselines,
+)
+from equerre_compensee.core.compensation import (
+    read_distances,
+    square_point,
+    square_points,
+)
+from equerre_compensee.core.dependencies import DependencyIndex
+from equerre_compensee.core.error_statistics import ErrorStatistics
+from equerre_compensee.core.scale_grid import elevation_factor
+from equerre_compensee.core.tolerance import (
+    DEFAULT_TOLERANCE_MODEL,
+    TableModel,
+    ToleranceModel,
+    register_tolerance_model,
+    tolerance_model,
+    tolerance_models,
+)
+from equerre_compensee.core.traverse import Traverse
+from equerre_compensee.scale_factors import ScaleGridCache
+from equerre_compensee.tasks import CompensationTask
+from equerre_compensee.utils import xpm_cursor
 
 # PyQGIS
 from qgis.core import (
+    NULL,
+    QgsApplication,
     QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsEditError,
     QgsFeature,
+    QgsFeatureRequest,
+    QgsField,
     QgsGeometry,
+    QgsPointLocator,
     QgsPointXY,
     QgsProject,
     QgsSimpleMarkerSymbolLayerBase,
+    QgsSnappingConfig,
     QgsVectorLayer,
     QgsWkbTypes,
-    edit,
 )
 from qgis.gui import (
     QgisInterface,
     QgsDockWidget,
     QgsDoubleSpinBox,
     QgsMapCanvas,
+    QgsMapCanvasItem,
     QgsMapTool,
     QgsRubberBand,
     QgsSnapIndicator,
 )
-from qgis.PyQt.QtCore import QEvent, QObject, QSize, Qt, QTimer, pyqtSignal
-from qgis.PyQt.QtGui import QColor, QCursor, QFocusEvent, QIcon, QKeySequence, QPixmap
+from qgis.PyQt.QtCore import (
+    QEvent,
+    QObject,
+    QPointF,
+    QRectF,
+    QSize,
+    QSizeF,
+    Qt,
+    QTimer,
+    QVariant,
+    pyqtSignal,
+)
+from qgis.PyQt.QtGui import (
+    QColor,
+    QCursor,
+    QFocusEvent,
+    QFont,
+    QFontMetricsF,
+    QIcon,
+    QKeySequence,
+    QPainter,
+    QPixmap,
+    QStaticText,
+    QTransform,
+)
 from qgis.PyQt.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QFileDialog,
     QFormLayout,
     QHBoxLayout,
     QLabel,
@@ -40,10 +101,10 @@ from qgis.PyQt.QtWidgets import (
     QShortcut,
     QSizePolicy,
     QSpacerItem,
+    QToolButton,
     QVBoxLayout,
     QWidget,
 )
-from qgis.utils import iface
 
 PLUGIN_PATH = os.path.dirname(equerre_compensee.__file__)
 ICON_MAPTOOL = QIcon(
@@ -55,19 +116,100 @@ ICON_CAPTURE = QIcon(
 EPSG = "EPSG:3948"
 
 
-class InfoLabel(QLabel):
-    """Frameless label usefull for tool tips"""
+class InfoOverlay(QgsMapCanvasItem):
+    """In-canvas overlay displaying the computed distance informations.
+
+    The text is laid out once per displayed values, as plain static texts,
+    and the item is only repainted when the values change at the overlay
+    precision.
+    """
+
+    MARGIN = 6
+    PADDING = 4
 
-    def __init__(self, parent: QWidget = None):
+    def __init__(self, canvas: QgsMapCanvas, precision: int = 3):
         """
-        :param parent: parent widget
+        :param canvas: a mapCanvas
+        :param precision: number of decimals of the displayed distances
         """
-        super().__init__(
-            parent, Qt.Window | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint
+        super().__init__(canvas)
+        self._canvas = canvas
+        self.precision = precision
+        self._values = None
+        self._lines = []
+        self._size = QSizeF()
+        self._font = QFont(canvas.font())
+        self._background = QColor(255, 255, 255, 200)
+        self.setZValue(1000)
+        self.setVisible(False)
+
+    def set_values(self, length: float, error: float, is_error: bool) -> None:
+        """Sets the displayed values, repaints only if the text changes
+        :param length: the computed length
+        :param error: the difference with the measured distance
+        :param is_error: True if the difference exceeds the tolerance
+        """
+        values = (
+            round(length, self.precision),
+            round(error, self.precision),
+            is_error,
+        )
+        if values == self._values:
+            return
+
+        self._values = values
+        texts = [
+            f"Calculée : {length:.{self.precision}f}",
+            f"Différence : {error:.{self.precision}f}",
+            f"Tolérance : {['✅', '❌'][is_error]}",
+        ]
+        metrics = QFontMetricsF(self._font)
+        self._lines = []
+        for text in texts:
+            static_text = QStaticText(text)
+            static_text.setTextFormat(Qt.PlainText)
+            static_text.prepare(QTransform(), self._font)
+            self._lines.append(static_text)
+        width = max(metrics.horizontalAdvance(text) for text in texts)
+        self.prepareGeometryChange()
+        self._size = QSizeF(
+            width + 2 * self.PADDING,
+            metrics.lineSpacing() * len(texts) + 2 * self.PADDING,
+        )
+        self.updatePosition()
+        self.update()
+
+    def clear(self) -> None:
+        """Hides the overlay and forgets the displayed values"""
+        self._values = None
+        self.setVisible(False)
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(QPointF(0, 0), self._size)
+
+    def updatePosition(self) -> None:
+        """Anchors the overlay to the bottom right corner of the canvas"""
+        self.setPos(
+            self._canvas.width() - self._size.width() - self.MARGIN,
+            self._canvas.height() - self._size.height() - self.MARGIN,
         )
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setAlignment(Qt.AlignRight)
-        self.setSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.Preferred)
+
+    def paint(self, painter: QPainter, option=None, widget=None) -> None:
+        """Paints the cached static texts
+        :param painter: the canvas painter
+        """
+        if not self._lines:
+            return
+
+        painter.fillRect(self.boundingRect(), self._background)
+        painter.setFont(self._font)
+        painter.setPen(QColor("#000000"))
+        line_spacing = QFontMetricsF(self._font).lineSpacing()
+        for index, static_text in enumerate(self._lines):
+            painter.drawStaticText(
+                QPointF(self.PADDING, self.PADDING + index * line_spacing),
+                static_text,
+            )
 
 
 class QgsDoubleSpinBoxV2(QgsDoubleSpinBox):
@@ -95,6 +237,16 @@ class CompasatedSquareDock(QgsDockWidget):
         self.setWindowTitle("Équerre compensée")
         self._canvas = self.iface.mapCanvas()
         self._point_lyr_name = "Points compensés"
+        self._baseline_lyr_name = "Lignes de base"
+        self._point_fields = {
+            "baseline": QVariant.LongLong,
+            "distance_one": QVariant.Double,
+            "distance_two": QVariant.Double,
+            "distance_measured": QVariant.Double,
+            "scale_factor": QVariant.Double,
+        }
+        self._dependencies = None
+        self._watched_layers = None
         central_widget = QWidget()
         self.setWidget(central_widget)
         self._main_lyt = QHBoxLayout(central_widget)
@@ -127,6 +279,15 @@ class CompasatedSquareDock(QgsDockWidget):
                 "decimals": 4,
                 "tooltip": "Distance mesurée sur le plan (Ctrl+3)",
             },
+            "elevation": {
+                "label": "Altitude :",
+                "min": -500,
+                "max": 5000,
+                "clearvalue": 0,
+                "decimals": 1,
+                "tooltip": "Hauteur ellipsoïdale du chantier, pour la réduction "
+                "des distances à l'ellipsoïde",
+            },
         }
         for spinbox, config in spinbox_configs.items():
             setattr(self, f"_{spinbox}", QgsDoubleSpinBoxV2())
@@ -147,6 +308,24 @@ class CompasatedSquareDock(QgsDockWidget):
         self.le_tolerance = QLineEdit()
         self.le_tolerance.setReadOnly(True)
         self.le_tolerance.setToolTip("Seuil d'erreur toléré")
+        self.cb_tolerance_model = QComboBox()
+        self.cb_tolerance_model.setToolTip("Modèle de tolérance")
+        self.cb_tolerance_model.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.pb_tolerance_table = QToolButton()
+        self.pb_tolerance_table.setText("…")
+        self.pb_tolerance_table.setToolTip(
+            "Charger une table de tolérance (distance;tolérance)"
+        )
+        tolerance_model_lyt = QHBoxLayout()
+        tolerance_model_lyt.addWidget(self.cb_tolerance_model)
+        tolerance_model_lyt.addWidget(self.pb_tolerance_table)
+        self.tolerance = 0.0
+        self.fill_tolerance_models(DEFAULT_TOLERANCE_MODEL)
+        self.cb_traverse = QCheckBox("Cheminement")
+        self.cb_traverse.setToolTip(
+            "Compenser le long d'une polyligne accrochée, "
+            "la distance 1 étant l'abscisse curviligne"
+        )
         self.pb_square_tool = QPushButton(ICON_MAPTOOL, "", central_widget)
         self.pb_square_tool.setMinimumSize(30, 30)
         self.pb_square_tool.setMaximumSize(30, 30)
@@ -157,13 +336,62 @@ class CompasatedSquareDock(QgsDockWidget):
         self.pb_create_point.setMaximumSize(30, 30)
         self.pb_create_point.setIconSize(QSize(28, 28))
         self.pb_create_point.setToolTip("Créer un point")
+        self.pb_import = QPushButton(
+            QgsApplication.getThemeIcon("/mActionAddDelimitedTextLayer.svg"),
+            "",
+            central_widget,
+        )
+        self.pb_import.setMinimumSize(30, 30)
+        self.pb_import.setMaximumSize(30, 30)
+        self.pb_import.setIconSize(QSize(24, 24))
+        self.pb_import.setToolTip(
+            "Créer les points d'un fichier de distances (abscisse;ordonnée)"
+        )
         spacerItem = QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding)
         # assembly
         self._form_lyt.addRow("Tolérance", self.le_tolerance)
+        self._form_lyt.addRow("Modèle", tolerance_model_lyt)
+        self.cb_search = QCheckBox("Recherche de la ligne de base")
+        self.cb_search.setToolTip(
+            "Proposer les couples de sommets proches du curseur "
+            "séparés de la distance mesurée"
+        )
+        self.cb_scale = QCheckBox("Réduction à la projection")
+        self.cb_scale.setToolTip(
+            "Convertir les distances terrain en distances projetées "
+            "(altération linéaire et réduction à l'ellipsoïde)"
+        )
+        self._form_lyt.addRow(self.cb_scale)
+        self._form_lyt.addRow(self.cb_traverse)
+        self._form_lyt.addRow(self.cb_search)
+        # error statistics
+        self._session_statistics = ErrorStatistics()
+        self._plan_statistics = {}
+        self.le_plan = QLineEdit()
+        self.le_plan.setPlaceholderText("Identifiant du plan")
+        self.le_plan.setToolTip("Plan des statistiques d'erreur")
+        self.lbl_statistics = QLabel()
+        self.lbl_statistics.setWordWrap(True)
+        self.lbl_statistics.setToolTip(
+            "Erreurs (calculée - mesurée) des points créés : nombre, moyenne, "
+            "écart-type, maximum et part hors tolérance"
+        )
+        self.pb_export_statistics = QToolButton()
+        self.pb_export_statistics.setIcon(
+            QgsApplication.getThemeIcon("/mActionFileSaveAs.svg")
+        )
+        self.pb_export_statistics.setToolTip("Exporter les statistiques d'erreur")
+        statistics_lyt = QHBoxLayout()
+        statistics_lyt.addWidget(self.lbl_statistics)
+        statistics_lyt.addWidget(self.pb_export_statistics)
+        self._form_lyt.addRow("Plan", self.le_plan)
+        self._form_lyt.addRow(statistics_lyt)
         self._tools_lyt.addWidget(self.pb_square_tool)
         self._tools_lyt.addWidget(self.pb_create_point)
+        self._tools_lyt.addWidget(self.pb_import)
         self._tools_lyt.addItem(spacerItem)
         self._square_tool = CompensatedSquareTool(self._canvas, self)
+        self._tasks = []
         # shortcuts
         self._cancel_shortcut = QShortcut(
             QKeySequence(Qt.Key_Escape), self.iface.mainWindow()
@@ -185,10 +413,22 @@ class CompasatedSquareDock(QgsDockWidget):
         )
         self.pb_square_tool.clicked.connect(self.set_map_tool)
         self.pb_create_point.clicked.connect(self.create_point)
+        self.pb_import.clicked.connect(self.import_distances)
+        self.cb_traverse.toggled.connect(self._square_tool.set_traverse_mode)
+        self.cb_search.toggled.connect(self._square_tool.set_search_mode)
+        self.cb_scale.toggled.connect(self.scale_correction_changed)
+        self.cb_tolerance_model.currentIndexChanged.connect(self.set_tolerance)
+        self.pb_tolerance_table.clicked.connect(self.load_tolerance_table)
+        self.le_plan.editingFinished.connect(self.update_statistics)
+        self.pb_export_statistics.clicked.connect(self.export_statistics)
         self._square_tool.pointCreated.connect(self.create_point)
         QgsProject.instance().crsChanged.connect(self.crs_changed)
+        QgsProject.instance().layersAdded.connect(self.watch_layers)
+        QgsProject.instance().layersWillBeRemoved.connect(self.layers_removed)
         # initial state
         self.crs_changed()
+        self.watch_layers()
+        self.update_statistics()
         self.set_tolerance()
 
     @property
@@ -219,13 +459,23 @@ class CompasatedSquareDock(QgsDockWidget):
             self._distance_measured.setValue(new_distance)
 
     @property
-    def ratio_one(self) -> float:
-        """Get the ratio between the first distance and the measured one"""
-        return (
-            self.distance_one / self.distance_measured
-            if self.distance_measured != 0
-            else 0
-        )
+    def elevation(self) -> float:
+        return self._elevation.value()
+
+    @elevation.setter
+    def elevation(self, new_elevation: float) -> None:
+        if isinstance(new_elevation, float) or isinstance(new_elevation, int):
+            self._elevation.setValue(new_elevation)
+
+    @property
+    def scale_correction(self) -> bool:
+        """Get if the ground distances are converted to grid distances"""
+        return self.cb_scale.isChecked()
+
+    @property
+    def tolerance_model(self) -> ToleranceModel:
+        """Get the selected tolerance model"""
+        return tolerance_model(self.cb_tolerance_model.currentData())
 
     def crs_changed(self) -> None:
         """On CRS change"""
@@ -243,21 +493,54 @@ class CompasatedSquareDock(QgsDockWidget):
         if not self._square_tool.point:
             return
 
-        layers = QgsProject.instance().mapLayersByName(self._point_lyr_name)
-        tests_lyr_exists = True
-        if not layers:
-            tests_lyr_exists = False
-        elif layers[0].dataProvider().name() != "memory":
-            tests_lyr_exists = False
-
-        if tests_lyr_exists:
-            point_lyr = layers[0]
+        point = self._square_tool.point
+        scale_factor = self._square_tool.line_scale_factor()
+        baseline_id = self.store_baseline()
+        self.record_statistics(self.plan, self.current_measurement(), 1, baseline_id)
+        if baseline_id is None:
+            point_lyr = self.point_layer()
+            point_feat = QgsFeature(point_lyr.fields())
+            point_feat.setGeometry(QgsGeometry.fromPointXY(point))
+            with _edit_command(point_lyr, "Équerre compensée : création d'un point"):
+                point_lyr.addFeature(point_feat)
         else:
+            self.add_points(
+                baseline_id,
+                self.distance_measured,
+                scale_factor,
+                [((self.distance_one, self.distance_two), (point.x(), point.y()))],
+            )
+
+        return True
+
+    def memory_layer(self, name: str) -> Union[QgsVectorLayer, None]:
+        """Returns the first memory layer of the project with a name
+        :param name: the layer name
+        """
+        layers = QgsProject.instance().mapLayersByName(name)
+        if layers and layers[0].dataProvider().name() == "memory":
+            return layers[0]
+        return None
+
+    def point_layer(self) -> QgsVectorLayer:
+        """Returns the memory layer of the created points, creates it if needed"""
+        point_lyr = self.memory_layer(self._point_lyr_name)
+        if point_lyr is None:
             point_lyr = QgsVectorLayer(
                 f"Point?crs={EPSG}", self._point_lyr_name, "memory"
             )
             QgsProject.instance().addMapLayer(point_lyr)
 
+        # points created by a previous version have no fields
+        missing_fields = [
+            QgsField(name, field_type)
+            for name, field_type in self._point_fields.items()
+            if point_lyr.fields().indexOf(name) < 0
+        ]
+        if missing_fields:
+            point_lyr.dataProvider().addAttributes(missing_fields)
+            point_lyr.updateFields()
+
         # point layer style
         point_lyr.renderer().symbol().symbolLayer(0).setShape(
             QgsSimpleMarkerSymbolLayerBase.Cross2
@@ -265,14 +548,429 @@ class CompasatedSquareDock(QgsDockWidget):
         point_lyr.renderer().symbol().setSize(2)
         point_lyr.renderer().symbol().symbolLayer(0).setStrokeColor(QColor("#a20000"))
         point_lyr.triggerRepaint()
-        iface.layerTreeView().refreshLayerSymbology(point_lyr.id())
+        self.iface.layerTreeView().refreshLayerSymbology(point_lyr.id())
 
-        point_feat = QgsFeature()
-        point_feat.setGeometry(QgsGeometry.fromPointXY(self._square_tool.point))
-        with edit(point_lyr):
-            point_lyr.addFeature(point_feat)
+        return point_lyr
 
-        return True
+    def baseline_layer(self) -> QgsVectorLayer:
+        """Returns the memory layer of the baselines, creates it if needed"""
+        baseline_lyr = self.memory_layer(self._baseline_lyr_name)
+        if baseline_lyr is None:
+            baseline_lyr = QgsVectorLayer(
+                f"LineString?crs={EPSG}", self._baseline_lyr_name, "memory"
+            )
+            baseline_lyr.renderer().symbol().setColor(QColor("#a20000"))
+            # the feature ids of a new layer restart
+            self.clear_baselines()
+            QgsProject.instance().addMapLayer(baseline_lyr)
+        return baseline_lyr
+
+    def clear_baselines(self) -> None:
+        """Clears the baseline of the existing points, which must not follow
+        the baselines of a new baseline layer with the same feature ids
+        """
+        point_lyr = self.memory_layer(self._point_lyr_name)
+        if point_lyr is None:
+            return
+        field_index = point_lyr.fields().indexOf("baseline")
+        if field_index < 0:
+            return
+
+        request = QgsFeatureRequest()
+        request.setFilterExpression('"baseline" IS NOT NULL')
+        request.setFlags(QgsFeatureRequest.NoGeometry)
+        request.setSubsetOfAttributes([field_index])
+        point_ids = [point_feat.id() for point_feat in point_lyr.getFeatures(request)]
+        if point_ids:
+            with _edit_command(
+                point_lyr, "Équerre compensée : dissociation des lignes de base"
+            ):
+                for point_id in point_ids:
+                    point_lyr.changeAttributeValue(point_id, field_index, NULL)
+        self.reset_dependencies()
+
+    def store_baseline(self) -> Union[int, None]:
+        """Stores the current baseline or traverse, once,
+        returns its feature id
+        """
+        if self._square_tool.baseline_id is not None:
+            return self._square_tool.baseline_id
+
+        vertices = self._square_tool.baseline_vertices()
+        if vertices is None:
+            return None
+
+        baseline_lyr = self.baseline_layer()
+        baseline_feat = QgsFeature(baseline_lyr.fields())
+        baseline_feat.setGeometry(
+            QgsGeometry.fromPolylineXY([QgsPointXY(x, y) for x, y in vertices])
+        )
+        # the provider gives the final feature id, unlike the edit buffer
+        _, baseline_feats = baseline_lyr.dataProvider().addFeatures([baseline_feat])
+        baseline_lyr.triggerRepaint()
+        self._square_tool.baseline_id = baseline_feats[0].id()
+        return self._square_tool.baseline_id
+
+    def add_points(
+        self,
+        baseline_id: int,
+        distance_measured: float,
+        scale_factor: float,
+        points: List[Tuple[Tuple[float, float], Tuple[float, float]]],
+    ) -> None:
+        """Adds points to the point layer, in an undoable edit command, with
+        the inputs they were computed from, and registers them as dependents
+        of their baseline
+        :param baseline_id: the baseline feature id
+        :param distance_measured: the baseline length measured on the plan
+        :param scale_factor: the ground to grid scale factor applied
+        :param points: ((abscissa, ordinate), (x, y)) tuples
+        """
+        point_lyr = self.point_layer()
+        self.watch_layers()
+        point_feats = []
+        for (distance_one, distance_two), (point_x, point_y) in points:
+            point_feat = QgsFeature(point_lyr.fields())
+            point_feat.setGeometry(
+                QgsGeometry.fromPointXY(QgsPointXY(point_x, point_y))
+            )
+            point_feat["baseline"] = baseline_id
+            point_feat["distance_one"] = distance_one
+            point_feat["distance_two"] = distance_two
+            point_feat["distance_measured"] = distance_measured
+            point_feat["scale_factor"] = scale_factor
+            point_feats.append(point_feat)
+
+        # the edit buffer gives the feature ids with the signal only, they
+        # change on commit, which resets the dependency index
+        point_ids = []
+        on_added = point_ids.append
+        with _edit_command(point_lyr, "Équerre compensée : création de points"):
+            point_lyr.featureAdded.connect(on_added)
+            try:
+                point_lyr.addFeatures(point_feats)
+            finally:
+                point_lyr.featureAdded.disconnect(on_added)
+        if self._dependencies is None:
+            # built from the attributes on the next use
+            return
+
+        for point_id, ((distance_one, distance_two), _) in zip(point_ids, points):
+            self._dependencies.add(
+                point_id,
+                baseline_id,
+                distance_one,
+                distance_two,
+                distance_measured,
+                scale_factor,
+            )
+
+    def watch_layers(self, *args) -> None:
+        """Watches the edits of the baselines and the deletions of the points,
+        including the uncommitted ones. The dependency index is rebuilt on
+        the next use, and after a rollback or the commit of added points
+        :param args: the added layers, returned by the signal, not used
+        """
+        point_lyr = self.memory_layer(self._point_lyr_name)
+        baseline_lyr = self.memory_layer(self._baseline_lyr_name)
+        if point_lyr is None or baseline_lyr is None:
+            return
+        if self._watched_layers == (point_lyr, baseline_lyr):
+            return
+
+        self.unwatch_layers()
+        baseline_lyr.geometryChanged.connect(self.baseline_changed)
+        baseline_lyr.featureDeleted.connect(self.baseline_deleted)
+        baseline_lyr.afterRollBack.connect(self.reset_dependencies)
+        point_lyr.featureDeleted.connect(self.point_deleted)
+        point_lyr.afterRollBack.connect(self.reset_dependencies)
+        point_lyr.committedFeaturesAdded.connect(self.reset_dependencies)
+        self._watched_layers = (point_lyr, baseline_lyr)
+        self._dependencies = None
+
+    def unwatch_layers(self) -> None:
+        """Stops watching the point and baseline layers"""
+        if self._watched_layers is None:
+            return
+
+        point_lyr, baseline_lyr = self._watched_layers
+        self._watched_layers = None
+        self._dependencies = None
+        try:
+            baseline_lyr.geometryChanged.disconnect(self.baseline_changed)
+            baseline_lyr.featureDeleted.disconnect(self.baseline_deleted)
+            baseline_lyr.afterRollBack.disconnect(self.reset_dependencies)
+            point_lyr.featureDeleted.disconnect(self.point_deleted)
+            point_lyr.afterRollBack.disconnect(self.reset_dependencies)
+            point_lyr.committedFeaturesAdded.disconnect(self.reset_dependencies)
+        except (RuntimeError, TypeError):
+            # the layers were already deleted
+            pass
+
+    def layers_removed(self, layer_ids: List[str]) -> None:
+        """Stops watching the point and baseline layers if one of them is
+        removed from the project, forgets the current baseline with its layer
+        :param layer_ids: the ids of the removed layers
+        """
+        baseline_lyr = self.memory_layer(self._baseline_lyr_name)
+        if baseline_lyr is not None and baseline_lyr.id() in layer_ids:
+            self._square_tool.baseline_id = None
+        if self._watched_layers is not None and any(
+            layer.id() in layer_ids for layer in self._watched_layers
+        ):
+            self.unwatch_layers()
+
+    def dependencies(self) -> DependencyIndex:
+        """Returns the index from the baselines to their points,
+        built from the point layer attributes the first time
+        """
+        self.watch_layers()
+        if self._dependencies is not None:
+            return self._dependencies
+
+        self._dependencies = DependencyIndex()
+        point_lyr = self.memory_layer(self._point_lyr_name)
+        if point_lyr is None or point_lyr.fields().indexOf("baseline") < 0:
+            return self._dependencies
+
+        request = QgsFeatureRequest()
+        request.setFlags(QgsFeatureRequest.NoGeometry)
+        request.setSubsetOfAttributes(list(self._point_fields), point_lyr.fields())
+        for point_feat in point_lyr.getFeatures(request):
+            if point_feat["baseline"] is None or point_feat["baseline"] == NULL:
+                continue
+            self._dependencies.add(
+                point_feat.id(),
+                point_feat["baseline"],
+                point_feat["distance_one"] or 0,
+                point_feat["distance_two"] or 0,
+                point_feat["distance_measured"] or 0,
+                point_feat["scale_factor"] or 1,
+            )
+        return self._dependencies
+
+    def baseline_changed(self, baseline_id: int, geometry: QgsGeometry) -> None:
+        """Recomputes the points of an edited baseline,
+        in a single undoable edit command of the point layer
+        :param baseline_id: the edited baseline feature id
+        :param geometry: the new baseline geometry
+        """
+        try:
+            locations = self.dependencies().recompute(
+                baseline_id,
+                [(vertex.x(), vertex.y()) for vertex in geometry.vertices()],
+            )
+        except ValueError:
+            # degenerated baseline
+            return
+        if not locations:
+            return
+
+        point_lyr = self._watched_layers[0]
+        with _edit_command(point_lyr, "Équerre compensée : recalcul des points"):
+            for point_id, (point_x, point_y) in locations.items():
+                point_lyr.changeGeometry(
+                    point_id, QgsGeometry.fromPointXY(QgsPointXY(point_x, point_y))
+                )
+
+    def baseline_deleted(self, baseline_id: int) -> None:
+        """Forgets the dependencies of a deleted baseline
+        :param baseline_id: the deleted baseline feature id
+        """
+        if self._dependencies is not None:
+            self._dependencies.remove_baseline(baseline_id)
+
+    def point_deleted(self, point_id: int) -> None:
+        """Forgets a deleted point
+        :param point_id: the deleted point feature id
+        """
+        if self._dependencies is not None:
+            self._dependencies.remove(point_id)
+
+    def reset_dependencies(self, *args) -> None:
+        """Drops the dependency index, rebuilt on the next use, when the
+        feature ids or the deletions of an editing session are no longer valid
+        :param args: the signal arguments, not used
+        """
+        self._dependencies = None
+
+    def import_distances(self) -> None:
+        """Creates the points of a distances file, in a background task,
+        from the current baseline or traverse
+        """
+        compute = self._square_tool.batch_compute()
+        if compute is None:
+            self.iface.messageBar().pushWarning(
+                "Équerre compensée",
+                "Saisir une ligne de base ou sélectionner un cheminement",
+            )
+            return
+
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Fichier de distances",
+            "",
+            "Textes délimités (*.csv *.txt);;Tous les fichiers (*)",
+        )
+        if not path:
+            return
+
+        task = CompensationTask(
+            f"Équerre compensée : {os.path.basename(path)}",
+            path,
+            read_distances,
+            compute,
+        )
+        task.chunkReady.connect(
+            partial(
+                self.commit_points,
+                self.store_baseline(),
+                self.distance_measured,
+                self._square_tool.line_scale_factor(),
+                self.plan,
+                self.current_measurement(),
+            )
+        )
+        task.taskCompleted.connect(partial(self.task_finished, task))
+        task.taskTerminated.connect(partial(self.task_finished, task))
+        # keeps a reference, the task manager doesn't own the Python object
+        self._tasks.append(task)
+        QgsApplication.taskManager().addTask(task)
+
+    def commit_points(
+        self,
+        baseline_id: int,
+        distance_measured: float,
+        scale_factor: float,
+        plan: str,
+        measurement: Union[Tuple[float, float, float], None],
+        points: List[Tuple[Tuple[float, float], Tuple[float, float]]],
+    ) -> None:
+        """Commits a chunk of points computed by a task to the point layer
+        :param baseline_id: the baseline feature id
+        :param distance_measured: the baseline length measured on the plan
+        :param scale_factor: the ground to grid scale factor applied
+        :param plan: the plan of the statistics
+        :param measurement: the baseline measurement at the task start
+        :param points: ((abscissa, ordinate), (x, y)) tuples
+        """
+        self.add_points(baseline_id, distance_measured, scale_factor, points)
+        self.record_statistics(plan, measurement, len(points), baseline_id)
+
+    @property
+    def plan(self) -> str:
+        """Get the plan identifier of the statistics"""
+        return self.le_plan.text().strip()
+
+    def current_measurement(self) -> Union[Tuple[float, float, float], None]:
+        """Returns the measured and computed grid distances of the current
+        baseline or traverse, with the tolerance, None without measured distance
+        """
+        computed = self._square_tool.baseline_length()
+        if self.distance_measured <= 0 or computed is None:
+            return None
+
+        measured = self.distance_measured * self._square_tool.line_scale_factor()
+        return measured, computed, self.tolerance
+
+    def record_statistics(
+        self,
+        plan: str,
+        measurement: Union[Tuple[float, float, float], None],
+        weight: int = 1,
+        baseline_id: Union[int, None] = None,
+    ) -> None:
+        """Adds the measurement of created points to the session and plan
+        statistics, once per baseline and measurement
+        :param plan: the plan identifier
+        :param measurement: the measured and computed distances and the tolerance
+        :param weight: the number of created points
+        :param baseline_id: the baseline feature id, None if not stored
+        """
+        if measurement is None:
+            return
+
+        key = None if baseline_id is None else (baseline_id, measurement)
+        self._session_statistics.add(*measurement, weight, key)
+        self._plan_statistics.setdefault(plan, ErrorStatistics()).add(
+            *measurement, weight, key
+        )
+        self.update_statistics()
+
+    def update_statistics(self) -> None:
+        """Shows the statistics of the session and of the current plan"""
+        lines = []
+        for title, stats in [
+            ("Session", self._session_statistics),
+            (self.plan or "Plan", self._plan_statistics.get(self.plan)),
+        ]:
+            if stats is None or not stats.count:
+                lines.append(f"{title} : aucun point")
+                continue
+            lines.append(
+                f"{title} : {stats.points} pts ({stats.count} mesures), "
+                f"moyenne {stats.errors.mean:+.3f}, "
+                f"σ {stats.errors.std:.3f}, max {stats.max_error:.3f}, "
+                f"hors tolérance {stats.out_of_tolerance_share:.0%}"
+            )
+            if stats.drift_suspected():
+                lines.append(
+                    f"⚠ Dérive d'échelle {stats.scale_drift:+.2%} : "
+                    "vérifier l'échelle du plan"
+                )
+        self.lbl_statistics.setText("\n".join(lines))
+
+    def export_statistics(self) -> None:
+        """Exports the session and plans statistics as a CSV file"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Statistiques d'erreur", "", "CSV (*.csv)"
+        )
+        if not path:
+            return
+
+        rows = [("session", "", self._session_statistics)] + [
+            ("plan", plan, stats) for plan, stats in self._plan_statistics.items()
+        ]
+        fieldnames = ["scope", "plan"] + list(ErrorStatistics().to_dict())
+        try:
+            with open(path, "w", newline="", encoding="utf-8") as statistics_file:
+                writer = csv.DictWriter(
+                    statistics_file, fieldnames=fieldnames, delimiter=";"
+                )
+                writer.writeheader()
+                for scope, plan, stats in rows:
+                    writer.writerow({"scope": scope, "plan": plan, **stats.to_dict()})
+        except OSError as exc:
+            self.iface.messageBar().pushCritical("Équerre compensée", str(exc))
+
+    def task_finished(self, task: CompensationTask) -> None:
+        """Reports the end of a task
+        :param task: the finished task
+        """
+        if task in self._tasks:
+            self._tasks.remove(task)
+        skipped = ""
+        if task.skipped:
+            numbers = ", ".join(str(number) for number in task.skipped[:10])
+            if len(task.skipped) > 10:
+                numbers += "…"
+            skipped = f", {len(task.skipped)} lignes ignorées ({numbers})"
+        if task.error:
+            self.iface.messageBar().pushCritical("Équerre compensée", task.error)
+        elif task.count < task.total or task.isCanceled():
+            self.iface.messageBar().pushWarning(
+                "Équerre compensée",
+                f"Import interrompu : {task.count}/{task.total} points créés"
+                + skipped,
+            )
+        elif task.skipped:
+            self.iface.messageBar().pushWarning(
+                "Équerre compensée", f"{task.count} points créés{skipped}"
+            )
+        else:
+            self.iface.messageBar().pushSuccess(
+                "Équerre compensée", f"{task.count} points créés"
+            )
 
     def set_point(self, value: float) -> None:
         """Sets the map tool point location
@@ -282,9 +980,52 @@ class CompasatedSquareDock(QgsDockWidget):
         if self.sender().objectName() == "distance_measured":
             self.set_tolerance()
 
-    def set_tolerance(self) -> None:
-        """Sets the tolerance threshold value"""
-        self.le_tolerance.setText(f"{tolerance_threshold(self.distance_measured):.3f}")
+    def scale_correction_changed(self, enabled: bool) -> None:
+        """Updates the point location with or without the scale correction
+        :param enabled: True if the scale correction is enabled, not used
+        """
+        self._square_tool.update_point()
+
+    def set_tolerance(self, *args) -> None:
+        """Sets the tolerance threshold value, kept for the map tool
+        :param args: the selected model index, returned by the signal, not used
+        """
+        self.tolerance = self.tolerance_model(self.distance_measured)
+        self.le_tolerance.setText(f"{self.tolerance:.3f}")
+
+    def fill_tolerance_models(self, name: str) -> None:
+        """Fills the tolerance models list with the registered models
+        :param name: the model to select
+        """
+        self.cb_tolerance_model.blockSignals(True)
+        self.cb_tolerance_model.clear()
+        for model in tolerance_models():
+            self.cb_tolerance_model.addItem(model.label, model.name)
+        self.cb_tolerance_model.setCurrentIndex(self.cb_tolerance_model.findData(name))
+        self.cb_tolerance_model.blockSignals(False)
+
+    def load_tolerance_table(self) -> None:
+        """Registers and selects a tolerance model read from a table file"""
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Table de tolérance",
+            "",
+            "Textes délimités (*.csv *.txt);;Tous les fichiers (*)",
+        )
+        if not path:
+            return
+
+        label = os.path.splitext(os.path.basename(path))[0]
+        try:
+            with open(path, encoding="utf-8-sig") as table_file:
+                model = TableModel.from_lines(f"table:{path}", label, table_file)
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            self.iface.messageBar().pushCritical("Équerre compensée", str(exc))
+            return
+
+        register_tolerance_model(model)
+        self.fill_tolerance_models(model.name)
+        self.set_tolerance()
 
     def eventFilter(self, source: QObject, event: QEvent) -> bool:
         """Catch all events on widgets with installed event filter
@@ -296,6 +1037,7 @@ class CompasatedSquareDock(QgsDockWidget):
                 self._distance_one,
                 self._distance_two,
                 self._distance_measured,
+                self._elevation,
             ]:
                 if event.key() in [Qt.Key_Return, Qt.Key_Enter]:
                     self.create_point()
@@ -303,6 +1045,40 @@ class CompasatedSquareDock(QgsDockWidget):
 
         return False
 
+    def unload(self) -> None:
+        """Disconnects signals and deletes the objects created by the dock"""
+        QgsProject.instance().crsChanged.disconnect(self.crs_changed)
+        QgsProject.instance().layersAdded.disconnect(self.watch_layers)
+        QgsProject.instance().layersWillBeRemoved.disconnect(self.layers_removed)
+        self.unwatch_layers()
+        for task in self._tasks:
+            task.chunkReady.disconnect()
+            task.taskCompleted.disconnect()
+            task.taskTerminated.disconnect()
+            task.cancel()
+        self._tasks = []
+        self._square_tool.pointCreated.disconnect(self.create_point)
+        self._square_tool.unload()
+        # a child of the canvas, which outlives the plugin
+        self._square_tool.deleteLater()
+        for shortcut in [
+            self._cancel_shortcut,
+            self._distance_one_shortcut,
+            self._distance_two_shortcut,
+            self._measured_distance_shortcut,
+        ]:
+            shortcut.activated.disconnect()
+            shortcut.setEnabled(False)
+            shortcut.setParent(None)
+            shortcut.deleteLater()
+        for spin_widget in [
+            self._distance_one,
+            self._distance_two,
+            self._distance_measured,
+            self._elevation,
+        ]:
+            spin_widget.removeEventFilter(self)
+
     def closeEvent(self, event) -> None:
         """Close event"""
         # for shortcut working the next time in the same QGIS instance
@@ -317,6 +1093,8 @@ class CompensatedSquareTool(QgsMapTool):
     """
 
     point_created = pyqtSignal(QgsPointXY, name="pointCreated")
+    SEARCH_RADIUS_PIXELS = 15
+    SEARCH_LIMIT = 5
 
     def __init__(self, canvas: QgsMapCanvas, dock: CompasatedSquareDock):
         """
@@ -326,12 +1104,23 @@ class CompensatedSquareTool(QgsMapTool):
         self._canvas = canvas
         super().__init__(self._canvas)
         self._dock = dock
-        self._info_label = InfoLabel()
-        self._info_model = (
-            "Calculée : {0:.3f}<br/>Différence : {1:.3f}<br/>Tolérance : {2}"
-        )
+        self._info_overlay = InfoOverlay(self._canvas)
+        self._is_error = None
         self.points_to_draw = []
+        self.baseline_id = None
+        self.traverse_mode = False
+        self.traverse = None
+        self._traverse_key = None
+        self._traverse_candidate = None
+        self.search_mode = False
+        self._search_done = False
+        self._baselines = []
+        self._baseline_index = 0
+        self._vertices = []
+        self._vertices_key = None
+        self._vertex_index = None
         self.crs = QgsCoordinateReferenceSystem(EPSG)
+        self._scale_grids = ScaleGridCache()
         self.rubber_line = QgsRubberBand(self._canvas, QgsWkbTypes.LineGeometry)
         self.rubber_line.setWidth(1)
         self.rubber_line.setColor(QColor("#FF0000"))
@@ -339,6 +1128,11 @@ class CompensatedSquareTool(QgsMapTool):
         self.rubber_new_point = QgsRubberBand(self._canvas, QgsWkbTypes.PointGeometry)
         self.rubber_new_point.setColor(QColor("#FF0000"))
 
+        self.rubber_candidates = QgsRubberBand(self._canvas, QgsWkbTypes.LineGeometry)
+        self.rubber_candidates.setWidth(1)
+        self.rubber_candidates.setColor(QColor(255, 0, 0, 90))
+        self.rubber_candidates.setLineStyle(Qt.DashLine)
+
         self.snap_indicator = QgsSnapIndicator(self._canvas)
         self.snapper = self._canvas.snappingUtils()
 
@@ -358,28 +1152,279 @@ class CompensatedSquareTool(QgsMapTool):
 
     def update_point(self) -> None:
         """Updates the point location"""
-        if not self.line:
+        if self.traverse_mode:
+            self.update_traverse_point()
             return
 
-        if self._dock.distance_measured == 0:
-            point_distance_one = self._dock.distance_one
-        else:
-            point_distance_one = self.line.length() * self._dock.ratio_one
+        line = self.line
+        if not line:
+            return
+
+        scale_factor = self.line_scale_factor()
+        try:
+            point_x, point_y = square_point(
+                (line.vertexAt(0).x(), line.vertexAt(0).y()),
+                (line.vertexAt(1).x(), line.vertexAt(1).y()),
+                self._dock.distance_one * scale_factor,
+                self._dock.distance_two * scale_factor,
+                self._dock.distance_measured * scale_factor,
+            )
+        except ValueError:
+            # the baseline has no direction yet
+            self.point = None
+            return
+        self.point = QgsGeometry.fromPointXY(QgsPointXY(point_x, point_y))
+
+    def update_traverse_point(self) -> None:
+        """Updates the point location along the traverse"""
+        if self.traverse is None:
+            return
+
+        scale_factor = self.line_scale_factor()
+        point_x, point_y = self.traverse.point_at(
+            self._dock.distance_one * scale_factor,
+            self._dock.distance_two * scale_factor,
+            self._dock.distance_measured * scale_factor,
+        )
+        self.point = QgsGeometry.fromPointXY(QgsPointXY(point_x, point_y))
+        self.update_info(self.traverse.length)
+
+    def scale_factor_at(self, point: QgsPointXY) -> float:
+        """Returns the factor converting a ground distance to a grid distance
+        at a location, 1 without the scale correction. The projection scale
+        factor comes from a grid precomputed over the canvas extent
+        :param point: a location
+        """
+        if not self._dock.scale_correction:
+            return 1.0
 
-        # second point isn't compensated
-        point_distance_two = self._dock.distance_two
-        line_angle = self.line.angleAtVertex(1)
+        grid = self._scale_grids.grid(self.crs, self._canvas.extent())
+        return grid.factor(point.x(), point.y()) * elevation_factor(
+            self._dock.elevation
+        )
+
+    def line_scale_factor(self) -> float:
+        """Returns the ground to grid factor at the middle of the current line"""
+        line = self.line
+        if not self._dock.scale_correction or not line or line.isEmpty():
+            return 1.0
+        return self.scale_factor_at(line.boundingBox().center())
+
+    def baseline_length(self) -> Union[float, None]:
+        """Returns the length of the current baseline or traverse"""
+        vertices = self.baseline_vertices()
+        if vertices is None:
+            return None
+        if self.traverse_mode:
+            return self.traverse.length
+        (start_x, start_y), (end_x, end_y) = vertices
+        return math.hypot(end_x - start_x, end_y - start_y)
+
+    def baseline_vertices(self) -> Union[List[Tuple[float, float]], None]:
+        """Returns the vertices of the current baseline or traverse"""
+        if self.traverse_mode:
+            return None if self.traverse is None else list(self.traverse.vertices)
+
+        line = self.line
+        if self.points_to_draw or not line or line.isEmpty():
+            return None
+        start = (line.vertexAt(0).x(), line.vertexAt(0).y())
+        end = (line.vertexAt(1).x(), line.vertexAt(1).y())
+        return None if start == end else [start, end]
+
+    def batch_compute(self) -> Union[Callable[[list], list], None]:
+        """Returns a function computing the points of (abscissa, ordinate)
+        tuples from the current baseline or traverse. It only uses copies
+        of the current values, so that it can run in a worker thread
+        """
+        scale_factor = self.line_scale_factor()
+        distance_measured = self._dock.distance_measured
+        if self.traverse_mode:
+            if self.traverse is None:
+                return None
+            return partial(
+                _traverse_points,
+                self.traverse,
+                scale_factor=scale_factor,
+                distance_measured=distance_measured,
+            )
 
-        point_x1 = self.line.vertexAt(0).x() + point_distance_one * math.sin(line_angle)
-        point_y1 = self.line.vertexAt(0).y() + point_distance_one * math.cos(line_angle)
-        point_x2 = point_x1 - point_distance_two * math.sin(
-            line_angle + math.radians(90)
+        vertices = self.baseline_vertices()
+        if vertices is None:
+            return None
+        start, end = vertices
+        return partial(
+            _baseline_points,
+            start,
+            end,
+            scale_factor=scale_factor,
+            distance_measured=distance_measured,
         )
-        point_y2 = point_y1 - point_distance_two * math.cos(
-            line_angle + math.radians(90)
+
+    def set_search_mode(self, enabled: bool) -> None:
+        """Switches the automatic baseline search
+        :param enabled: True to search the baselines
+        """
+        self.deactivate()
+        self.search_mode = enabled
+        self._vertices_key = None
+        self._vertices = []
+        self._vertex_index = None
+
+    def snappable_layers(self) -> List[QgsVectorLayer]:
+        """Returns the vector layers of the canvas whose vertices are
+        snappable, according to the snapping configuration
+        """
+        config = self.snapper.config()
+        if not config.enabled():
+            return []
+
+        layers = []
+        for layer in self._canvas.layers():
+            if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
+                continue
+            if config.mode() == QgsSnappingConfig.ActiveLayer:
+                snappable = layer == self._canvas.currentLayer()
+                type_flag = config.typeFlag()
+            elif config.mode() == QgsSnappingConfig.AdvancedConfiguration:
+                settings = config.individualLayerSettings(layer)
+                snappable = settings.valid() and settings.enabled()
+                type_flag = settings.typeFlag()
+            else:
+                snappable = True
+                type_flag = config.typeFlag()
+            if snappable and type_flag & QgsSnappingConfig.VertexFlag:
+                layers.append(layer)
+        return layers
+
+    def vertex_index(self, cell_size: float) -> GridIndex:
+        """Returns the grid index of the visible snappable vertices. The
+        vertices are fetched again when the extent or the snappable layers
+        change, the grid is rebuilt when the cell size changes
+        :param cell_size: size of the grid cells
+        """
+        extent = self._canvas.extent()
+        layers = self.snappable_layers()
+        key = (extent.toString(), tuple(layer.id() for layer in layers))
+        if key != self._vertices_key:
+            self._vertices_key = key
+            self._vertex_index = None
+            vertices = set()
+            for layer in layers:
+                transform = QgsCoordinateTransform(
+                    layer.crs(), self.crs, QgsProject.instance()
+                )
+                request = QgsFeatureRequest()
+                request.setFilterRect(
+                    transform.transformBoundingBox(
+                        extent, QgsCoordinateTransform.ReverseTransform
+                    )
+                )
+                request.setNoAttributes()
+                for feature in layer.getFeatures(request):
+                    geometry = feature.geometry()
+                    geometry.transform(transform)
+                    for vertex in geometry.vertices():
+                        if extent.contains(vertex.x(), vertex.y()):
+                            vertices.add((vertex.x(), vertex.y()))
+            self._vertices = list(vertices)
+
+        if self._vertex_index is None or self._vertex_index.cell_size != cell_size:
+            self._vertex_index = GridIndex(self._vertices, cell_size)
+        return self._vertex_index
+
+    def search_baselines(self, cursor: QgsPointXY) -> List[BaselineCandidate]:
+        """Returns the baselines near the cursor matching the measured distance
+        :param cursor: the cursor location
+        """
+        distance = self._dock.distance_measured
+        if distance <= 0:
+            return []
+
+        tolerance = self._dock.tolerance
+        return find_baselines(
+            self.vertex_index(distance + tolerance),
+            (cursor.x(), cursor.y()),
+            self.SEARCH_RADIUS_PIXELS * self._canvas.mapUnitsPerPixel(),
+            distance * self.scale_factor_at(cursor),
+            tolerance,
+            self.SEARCH_LIMIT,
         )
-        point_geometry = QgsGeometry.fromPointXY(QgsPointXY(point_x2, point_y2))
-        self.point = point_geometry
+
+    def searchMoveEvent(self, event) -> None:
+        """
+        On mouse move event in search mode, shows the candidate baselines,
+        the best one as the baseline, or the one selected with the wheel
+        if it is still a candidate
+        """
+        selected = (
+            self._baselines[self._baseline_index][:2] if self._baselines else None
+        )
+        self._baselines = self.search_baselines(event.mapPoint())
+        self._baseline_index = next(
+            (
+                index
+                for index, candidate in enumerate(self._baselines)
+                if candidate[:2] == selected
+            ),
+            0,
+        )
+        self.show_baselines()
+
+    def show_baselines(self) -> None:
+        """Shows the selected candidate baseline as the baseline, the other
+        ones as the candidates
+        """
+        self.rubber_candidates.reset(QgsWkbTypes.LineGeometry)
+        if not self._baselines:
+            self.line = None
+            self.point = None
+            self._info_overlay.clear()
+            return
+
+        for index, candidate in enumerate(self._baselines):
+            if index != self._baseline_index:
+                self.rubber_candidates.addGeometry(
+                    QgsGeometry.fromPolylineXY(
+                        [QgsPointXY(*candidate.start), QgsPointXY(*candidate.end)]
+                    ),
+                    self.crs,
+                )
+        selected = self._baselines[self._baseline_index]
+        self.line = QgsGeometry.fromPolylineXY(
+            [QgsPointXY(*selected.start), QgsPointXY(*selected.end)]
+        )
+        self.update_point()
+        self.update_info(selected.length)
+
+    def wheelEvent(self, event) -> None:
+        """
+        On mouse wheel event in search mode, with the Shift key, selects
+        the next or the previous candidate baseline. Otherwise the canvas
+        handles the event
+        """
+        if (
+            not self.search_mode
+            or self._search_done
+            or len(self._baselines) < 2
+            or not event.modifiers() & Qt.ShiftModifier
+        ):
+            event.ignore()
+            return
+
+        # Shift may turn the vertical scroll into an horizontal one
+        delta = event.angleDelta().y() or event.angleDelta().x()
+        step = -1 if delta > 0 else 1
+        self._baseline_index = (self._baseline_index + step) % len(self._baselines)
+        self.show_baselines()
+        event.accept()
+
+    def set_traverse_mode(self, enabled: bool) -> None:
+        """Switches between the baseline and the traverse modes
+        :param enabled: True for the traverse mode
+        """
+        self.deactivate()
+        self.traverse_mode = enabled
 
     @property
     def line(self) -> Union[QgsGeometry, None]:
@@ -387,6 +1432,8 @@ class CompensatedSquareTool(QgsMapTool):
 
     @line.setter
     def line(self, new_line: Union[QgsGeometry, None]) -> None:
+        # a new baseline, not stored yet
+        self.baseline_id = None
         if isinstance(new_line, QgsGeometry):
             self.rubber_line.setToGeometry(new_line, self.crs)
         elif new_line is None:
@@ -397,7 +1444,30 @@ class CompensatedSquareTool(QgsMapTool):
         self.line = None
         self.point = None
         self.points_to_draw = []
-        self._info_label.close()
+        self.traverse = None
+        self._traverse_key = None
+        self._traverse_candidate = None
+        self._search_done = False
+        self._baselines = []
+        self._baseline_index = 0
+        self.rubber_candidates.reset(QgsWkbTypes.LineGeometry)
+        self._info_overlay.clear()
+
+    def unload(self) -> None:
+        """Removes the canvas items created by the map tool"""
+        if self._canvas.mapTool() is self:
+            self._canvas.unsetMapTool(self)
+        self.deactivate()
+        self.snap_indicator.setMatch(QgsPointLocator.Match())
+        scene = self._canvas.scene()
+        for item in [
+            self.rubber_line,
+            self.rubber_new_point,
+            self.rubber_candidates,
+            self._info_overlay,
+        ]:
+            if item.scene() is scene:
+                scene.removeItem(item)
 
     def canvasMoveEvent(self, event):
         """
@@ -407,6 +1477,14 @@ class CompensatedSquareTool(QgsMapTool):
         snapMatch = self.snapper.snapToMap(event.pos())
         self.snap_indicator.setMatch(snapMatch)
 
+        if self.traverse_mode:
+            self.traverseMoveEvent(snapMatch)
+            return
+
+        if self.search_mode and not self._search_done:
+            self.searchMoveEvent(event)
+            return
+
         if not self.points_to_draw:
             return
 
@@ -424,23 +1502,114 @@ class CompensatedSquareTool(QgsMapTool):
         self.update_point()
 
         if self._canvas.underMouse():
-            self._info_label.move(
-                self._canvas.mapToGlobal(self._canvas.mouseLastXY()).x() - 100,
-                self._canvas.mapToGlobal(self._canvas.mouseLastXY()).y() + 15,
-            )
-            error_distance = abs(self._dock.distance_measured - self.line.length())
-            is_error = error_distance > tolerance_threshold(
-                self._dock.distance_measured
-            )
+            self.update_info(self.line.length())
+
+    def update_info(self, line_length: float) -> None:
+        """Updates the cursor and the overlay informations
+        :param line_length: the computed length of the line or the traverse
+        """
+        error_distance = abs(
+            self._dock.distance_measured * self.line_scale_factor() - line_length
+        )
+        is_error = error_distance > self._dock.tolerance
+        if is_error != self._is_error:
+            self._is_error = is_error
             self.cursor = QCursor(
                 QPixmap(xpm_cursor(buffer_color=["#000000", "#FFFFFF"][is_error]))
             )
             self.setCursor(self.cursor)
-            info_text = self._info_model.format(
-                self.line.length(), error_distance, ["✅", "❌"][is_error]
+        self._info_overlay.set_values(line_length, error_distance, is_error)
+        self._info_overlay.setVisible(True)
+
+    def match_traverse(self, match: QgsPointLocator.Match) -> Union[Traverse, None]:
+        """Returns the traverse of the snapped line or polygon boundary,
+        the last one is cached while the cursor stays on the same feature
+        :param match: a snapping match
+        """
+        layer = match.layer()
+        if not match.isValid() or layer is None:
+            # the cursor may come back on the same feature
+            self._traverse_key = None
+            self._traverse_candidate = None
+            return None
+
+        key = (layer.id(), match.featureId())
+        if key == self._traverse_key:
+            return self._traverse_candidate
+
+        self._traverse_key = key
+        self._traverse_candidate = None
+        geometry = layer.getFeature(match.featureId()).geometry()
+        if geometry.type() == QgsWkbTypes.PolygonGeometry:
+            geometry = QgsGeometry(geometry.constGet().boundary())
+        elif geometry.type() != QgsWkbTypes.LineGeometry:
+            return None
+
+        geometry.transform(
+            QgsCoordinateTransform(layer.crs(), self.crs, QgsProject.instance())
+        )
+        match_geometry = QgsGeometry.fromPointXY(match.point())
+        part = min(
+            geometry.asGeometryCollection(),
+            key=lambda part: part.distance(match_geometry),
+        )
+        try:
+            self._traverse_candidate = Traverse(
+                [(vertex.x(), vertex.y()) for vertex in part.vertices()]
             )
-            self._info_label.setText(info_text)
-            self._info_label.show()
+        except ValueError:
+            pass
+        return self._traverse_candidate
+
+    def traverse_geometry(self, traverse: Traverse) -> QgsGeometry:
+        """Returns a traverse as a line geometry
+        :param traverse: a traverse
+        """
+        return QgsGeometry.fromPolylineXY(
+            [QgsPointXY(x, y) for x, y in traverse.vertices]
+        )
+
+    def traverseMoveEvent(self, match: QgsPointLocator.Match) -> None:
+        """
+        On mouse move event in traverse mode, previews the snapped traverse
+        until one is selected
+        :param match: the snapping match under the cursor
+        """
+        if self.traverse is not None:
+            return
+
+        previous_key = self._traverse_key
+        candidate = self.match_traverse(match)
+        if candidate is None:
+            self.line = None
+            self._info_overlay.clear()
+        elif self._traverse_key != previous_key:
+            self.line = self.traverse_geometry(candidate)
+            self.update_info(candidate.length)
+
+    def traverseReleaseEvent(self, match: QgsPointLocator.Match) -> None:
+        """
+        On mouse click event in traverse mode, selects the snapped traverse,
+        from its end closest to the click, or for a ring (a polygon boundary)
+        from its vertex closest to the click
+        :param match: the snapping match under the cursor
+        """
+        candidate = self.match_traverse(match)
+        if candidate is None:
+            return
+
+        click = (match.point().x(), match.point().y())
+        if candidate.is_closed:
+            candidate = candidate.rotated(candidate.nearest_vertex(click))
+        elif math.hypot(
+            candidate.vertices[-1][0] - click[0], candidate.vertices[-1][1] - click[1]
+        ) < math.hypot(
+            candidate.vertices[0][0] - click[0], candidate.vertices[0][1] - click[1]
+        ):
+            candidate = candidate.reversed()
+        self.traverse = candidate
+        self.line = self.traverse_geometry(candidate)
+        self.update_traverse_point()
 
     def canvasReleaseEvent(self, event):
         """
@@ -449,6 +1618,27 @@ class CompensatedSquareTool(QgsMapTool):
         """
         snapMatch = self.snapper.snapToMap(event.pos())
         self.snap_indicator.setMatch(snapMatch)
+        if self.traverse_mode:
+            self.traverseReleaseEvent(snapMatch)
+            return
+
+        if self.search_mode and self._search_done:
+            # a click after a completed search starts a new one
+            self.deactivate()
+            self.searchMoveEvent(event)
+            return
+
+        if self.search_mode:
+            if self._baselines:
+                # the selected candidate is already the baseline
+                self._search_done = True
+                self._baselines = []
+                self._baseline_index = 0
+                self.rubber_candidates.reset(QgsWkbTypes.LineGeometry)
+                self._info_overlay.clear()
+                self.point_created.emit(self.point)
+            return
+
         ev_mappoint = (
             self.snap_indicator.match().point()
             if self.snap_indicator.match().type()
@@ -456,7 +1646,66 @@ class CompensatedSquareTool(QgsMapTool):
         )
         if self.points_to_draw:
             self.points_to_draw = []
-            self._info_label.close()
+            self._info_overlay.clear()
             self.point_created.emit(self.point)
         else:
             self.points_to_draw = [ev_mappoint, ev_mappoint]
+
+
+@contextmanager
+def _edit_command(layer: QgsVectorLayer, text: str):
+    """Groups edits of a layer in an undoable edit command. A layer which
+    isn't in editing mode is switched to it, and its changes are committed
+    at the end, like with the edit context manager of QGIS
+    :param layer: a vector layer
+    :param text: the command text, shown in the undo history
+    """
+    committing = not layer.isEditable()
+    if committing and not layer.startEditing():
+        raise QgsEditError([f"La couche {layer.name()} n'est pas modifiable"])
+
+    layer.beginEditCommand(text)
+    try:
+        yield layer
+    except Exception:
+        layer.destroyEditCommand()
+        if committing:
+            layer.rollBack()
+        raise
+    layer.endEditCommand()
+    if committing and not layer.commitChanges():
+        errors = layer.commitErrors()
+        layer.rollBack()
+        raise QgsEditError(errors)
+    layer.triggerRepaint()
+
+
+def _baseline_points(
+    start: Tuple[float, float],
+    end: Tuple[float, float],
+    distances: List[Tuple[float, float]],
+    scale_factor: float = 1,
+    distance_measured: float = 0,
+) -> List[Tuple[float, float]]:
+    return square_points(
+        start,
+        end,
+        [
+            (distance_one * scale_factor, distance_two * scale_factor)
+            for distance_one, distance_two in distances
+        ],
+        distance_measured * scale_factor,
+    )
+
+
+def _traverse_points(
+    traverse: Traverse,
+    distances: List[Tuple[float, float]],
+    scale_factor: float = 1,
+    distance_measured: float = 0,
+) -> List[Tuple[float, float]]:
+    return traverse.points_at(
+        [distance_one * scale_factor for distance_one, _ in distances],
+        [distance_two * scale_factor for _, distance_two in distances],
+        distance_measured * scale_factor,
+    )
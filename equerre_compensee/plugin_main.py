@@ -147,7 +147,19 @@ class EquerreCompenseePlugin:
         for action in self.actions:
             self.iface.removePluginVectorMenu("&Equerre Compensée", action)
             self.iface.removeToolBarIcon(action)
-        # remove the toolbar
+            self.toolbar.removeAction(action)
+            action.deleteLater()
+        self.actions = []
+        # remove the dock and everything it created
+        if self.dockwidget is not None:
+            self.iface.removeDockWidget(self.dockwidget)
+            self.dockwidget.unload()
+            self.dockwidget.deleteLater()
+            self.dockwidget = None
+        self.pluginIsActive = False
+        # remove the toolbar, if no other plugin uses it
+        if not self.toolbar.actions():
+            self.toolbar.deleteLater()
         del self.toolbar
 
     def run(self):
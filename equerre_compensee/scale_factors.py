@@ -0,0 +1,88 @@
+#! python3  # noqa: E265
+
+# PyQGIS
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsPointXY,
+    QgsProject,
+    QgsRectangle,
+)
+
+from equerre_compensee.core.scale_grid import ScaleGrid
+
+
+class ScaleGridCache:
+    """Scale factor grids of projected CRS, one per CRS.
+
+    A grid is built over the requested extent, with a margin, and only
+    rebuilt when an extent goes out of it.
+    """
+
+    MAX_NODES = 64
+
+    def __init__(self, step: float = 1000, margin: float = 0.5):
+        """
+        :param step: the minimum spacing of the grid nodes, in CRS units
+        :param margin: the margin around the requested extent, as a ratio of
+            its size
+        """
+        self.step = step
+        self.margin = margin
+        self._grids = {}
+
+    def clear(self) -> None:
+        """Forgets the grids"""
+        self._grids = {}
+
+    def grid(
+        self, crs: QgsCoordinateReferenceSystem, extent: QgsRectangle
+    ) -> ScaleGrid:
+        """Returns the scale factor grid of a CRS covering an extent
+        :param crs: a projected CRS
+        :param extent: the working area, in the CRS
+        """
+        key = crs.authid() or crs.toWkt()
+        grid = self._grids.get(key)
+        if grid is not None and grid.contains(
+            extent.xMinimum(), extent.yMinimum(), extent.xMaximum(), extent.yMaximum()
+        ):
+            return grid
+
+        area = QgsRectangle(extent)
+        area.grow(self.margin * max(extent.width(), extent.height()))
+        if grid is not None:
+            # keeps covering the previous working area
+            area.combineExtentWith(
+                QgsRectangle(grid.x_min, grid.y_min, grid.x_max, grid.y_max)
+            )
+        step = max(self.step, max(area.width(), area.height()) / self.MAX_NODES)
+        grid = ScaleGrid.build(
+            area.xMinimum(),
+            area.yMinimum(),
+            area.xMaximum(),
+            area.yMaximum(),
+            step,
+            projection_scale_factor(crs),
+        )
+        self._grids[key] = grid
+        return grid
+
+
+def projection_scale_factor(crs: QgsCoordinateReferenceSystem):
+    """Returns a function computing the scale factor of a projected CRS
+    at a location in this CRS
+    :param crs: a projected CRS
+    """
+    to_geographic = QgsCoordinateTransform(
+        crs, QgsCoordinateReferenceSystem("EPSG:4326"), QgsProject.instance()
+    )
+
+    def scale_factor(x: float, y: float) -> float:
+        factors = crs.factors(to_geographic.transform(QgsPointXY(x, y)))
+        if not factors.isValid():
+            return 1.0
+        # conformal projections have the same scale in every direction
+        return factors.meridionalScale()
+
+    return scale_factor
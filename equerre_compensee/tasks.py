@@ -0,0 +1,69 @@
+#! python3  # noqa: E265
+
+# standard
+from typing import Callable, List, Tuple
+
+# PyQGIS
+from qgis.core import QgsTask
+from qgis.PyQt.QtCore import pyqtSignal
+
+Point = Tuple[float, float]
+
+
+class CompensationTask(QgsTask):
+    """A task computing compensated points in background, by chunks.
+
+    Each computed chunk is emitted with ``chunkReady``, as
+    ((abscissa, ordinate), (x, y)) tuples, received in the main thread
+    which commits it to the output layer. On cancellation, the
+    chunks already emitted are kept.
+    """
+
+    chunk_ready = pyqtSignal(list, name="chunkReady")
+
+    def __init__(
+        self,
+        description: str,
+        path: str,
+        read: Callable[[List[str], List[int]], list],
+        compute: Callable[[list], List[Point]],
+        chunk_size: int = 1000,
+    ):
+        """
+        :param description: the task description, shown in the task manager
+        :param path: the delimited text file of the distances
+        :param read: the function reading the distances from the file lines,
+            appending the numbers of the skipped lines to its second argument
+        :param compute: the function computing the points of distances,
+            must not use any QGIS or Qt object of the main thread
+        :param chunk_size: number of points committed at once
+        """
+        super().__init__(description, QgsTask.CanCancel)
+        self.path = path
+        self._read = read
+        self._compute = compute
+        self.chunk_size = chunk_size
+        self.count = 0
+        self.total = 0
+        self.skipped = []
+        self.error = None
+
+    def run(self) -> bool:
+        """Computes the points, in a worker thread"""
+        try:
+            with open(self.path, encoding="utf-8-sig") as distances_file:
+                distances = self._read(distances_file.readlines(), self.skipped)
+        except (OSError, UnicodeDecodeError) as exc:
+            self.error = str(exc)
+            return False
+
+        self.total = len(distances)
+        for start in range(0, self.total, self.chunk_size):
+            if self.isCanceled():
+                return False
+            chunk = distances[start : start + self.chunk_size]
+            points = self._compute(chunk)
+            self.count += len(points)
+            self.chunk_ready.emit(list(zip(chunk, points)))
+            self.setProgress(100 * self.count / self.total)
+        return True
@@ -4,6 +4,9 @@ from functools import lru_cache
 
 from qgis.PyQt.QtWidgets import QToolBar
 
+# moved to the Qt-free core package, kept here for compatibility
+from equerre_compensee.core.tolerance import tolerance_threshold  # noqa: F401
+
 
 @lru_cache(maxsize=5)
 def xpm_cursor(main_color: str = "#000000", buffer_color: str = "#FFFFFF") -> list:
@@ -65,10 +68,3 @@ def title_normalize(title: str) -> str:
         new_title = new_title.replace(char, "_")
 
     return new_title
-
-
-def tolerance_threshold(distance: float) -> float:
-    """Returns a tolerance from a distance
-    :param distance: a cartesian distance
-    """
-    return 0.014 * distance**0.5 + 0.0001 * distance + 0.03
@@ -0,0 +1,358 @@
+#! python3  # noqa E265
+
+"""
+    Record and replay mouse and keyboard sessions of the compensated square tool.
+
+    Record a session from the QGIS Python console, with the plugin dock opened:
+
+    .. code-block:: python
+        from tests.qgis.replay import InteractionRecorder
+        plugin = qgis.utils.plugins["equerre_compensee"]
+        recorder = InteractionRecorder(iface.mapCanvas(), plugin.dockwidget)
+        recorder.start()
+        # ... work with the tool ...
+        recorder.stop()
+        recorder.save("/tmp/session.jsonl")
+
+    Replay it headlessly, from the repo root folder:
+
+    .. code-block:: bash
+        # a recorded session
+        QT_QPA_PLATFORM=offscreen python -m tests.qgis.replay /tmp/session.jsonl
+        # a synthetic session
+        QT_QPA_PLATFORM=offscreen python -m tests.qgis.replay --features 5000
+"""
+
+# standard library
+import argparse
+import json
+import math
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# PyQGIS
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsFeature,
+    QgsGeometry,
+    QgsPointXY,
+    QgsProject,
+    QgsRectangle,
+    QgsSnappingConfig,
+    QgsTolerance,
+    QgsVectorLayer,
+)
+from qgis.gui import QgsMapCanvas
+from qgis.PyQt.QtCore import QCoreApplication, QEvent, QObject, QPointF, QSize, Qt
+from qgis.PyQt.QtGui import QKeyEvent, QMouseEvent
+from qgis.testing import start_app
+from qgis.testing.mocked import get_iface
+
+# project
+from equerre_compensee.gui.widgets import EPSG, CompasatedSquareDock
+
+FRAME_BUDGET_MS = 1000 / 60
+SPINBOXES = ["distance_one", "distance_two", "distance_measured"]
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class InteractionRecorder(QObject):
+    """Records the canvas mouse events and the dock edits of a session.
+
+    Mouse positions are stored in map coordinates, so that a session can be
+    replayed on a canvas of another size.
+    """
+
+    def __init__(self, canvas: QgsMapCanvas, dock: CompasatedSquareDock):
+        """
+        :param canvas: the mapCanvas used by the tool
+        :param dock: the compensated square dock
+        """
+        super().__init__()
+        self._canvas = canvas
+        self._dock = dock
+        self._start = 0
+        self.events = []
+
+    def start(self) -> None:
+        """Starts recording"""
+        self.events = []
+        self._start = time.perf_counter()
+        self._canvas.viewport().installEventFilter(self)
+        for name in SPINBOXES:
+            spin_widget = getattr(self._dock, f"_{name}")
+            spin_widget.installEventFilter(self)
+            spin_widget.valueChanged.connect(self._record_value)
+
+    def stop(self) -> None:
+        """Stops recording"""
+        self._canvas.viewport().removeEventFilter(self)
+        for name in SPINBOXES:
+            spin_widget = getattr(self._dock, f"_{name}")
+            spin_widget.removeEventFilter(self)
+            spin_widget.valueChanged.disconnect(self._record_value)
+
+    def save(self, path: str) -> None:
+        """Saves the recorded session as JSON lines
+        :param path: the session file path
+        """
+        with open(path, "w", encoding="utf-8") as session_file:
+            for event in self.events:
+                session_file.write(json.dumps(event) + "\n")
+
+    def _elapsed(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def _record_value(self, value: float) -> None:
+        self.events.append(
+            {
+                "t": self._elapsed(),
+                "type": "spin",
+                "name": self.sender().objectName(),
+                "value": value,
+            }
+        )
+
+    def eventFilter(self, source: QObject, event: QEvent) -> bool:
+        """Records the event, never filters it
+        :param source: the Qt Object who fires the event
+        :param event: the fired event
+        """
+        if event.type() in [QEvent.MouseMove, QEvent.MouseButtonRelease]:
+            map_point = self._canvas.getCoordinateTransform().toMapCoordinates(
+                event.pos()
+            )
+            self.events.append(
+                {
+                    "t": self._elapsed(),
+                    "type": "move" if event.type() == QEvent.MouseMove else "release",
+                    "x": map_point.x(),
+                    "y": map_point.y(),
+                }
+            )
+        elif event.type() == QEvent.KeyRelease and event.key() in [
+            Qt.Key_Return,
+            Qt.Key_Enter,
+        ]:
+            self.events.append(
+                {"t": self._elapsed(), "type": "enter", "name": source.objectName()}
+            )
+        return False
+
+
+class InteractionReplayer:
+    """Replays a session on an offscreen canvas and measures each event latency.
+
+    Mouse events are sent to the canvas viewport, like the window system
+    does, so the latency of an event covers its dispatch by the canvas,
+    its handling by the tool or the dock and the synchronous repaint of
+    the canvas viewport.
+    """
+
+    def __init__(self, canvas: QgsMapCanvas, dock: CompasatedSquareDock):
+        """
+        :param canvas: the mapCanvas used by the tool
+        :param dock: the compensated square dock
+        """
+        self._canvas = canvas
+        self._dock = dock
+        self.latencies = {}
+
+    def replay(self, events: List[dict]) -> Dict[str, List[float]]:
+        """Replays the events, returns the latencies in ms by event type
+        :param events: the recorded events
+        """
+        self._dock.set_map_tool()
+        # the tool only updates its overlay when the mouse is over the canvas
+        self._canvas.setAttribute(Qt.WA_UnderMouse, True)
+        self.latencies = {}
+        for event in events:
+            start = time.perf_counter()
+            self._dispatch(event)
+            self._canvas.viewport().repaint()
+            QCoreApplication.processEvents()
+            self.latencies.setdefault(event["type"], []).append(
+                (time.perf_counter() - start) * 1000
+            )
+        return self.latencies
+
+    def _dispatch(self, event: dict) -> None:
+        if event["type"] in ["move", "release"]:
+            pixel = self._canvas.getCoordinateTransform().transform(
+                QgsPointXY(event["x"], event["y"])
+            )
+            position = QPointF(round(pixel.x()), round(pixel.y()))
+            if event["type"] == "move":
+                mouse_events = [(QEvent.MouseMove, Qt.NoButton, Qt.NoButton)]
+            else:
+                # a click, the tool acts on the release
+                mouse_events = [
+                    (QEvent.MouseButtonPress, Qt.LeftButton, Qt.LeftButton),
+                    (QEvent.MouseButtonRelease, Qt.LeftButton, Qt.NoButton),
+                ]
+            for event_type, button, buttons in mouse_events:
+                QCoreApplication.sendEvent(
+                    self._canvas.viewport(),
+                    QMouseEvent(event_type, position, button, buttons, Qt.NoModifier),
+                )
+        elif event["type"] == "spin":
+            getattr(self._dock, f"_{event['name']}").setValue(event["value"])
+        elif event["type"] == "enter":
+            QCoreApplication.sendEvent(
+                getattr(self._dock, f"_{event['name']}"),
+                QKeyEvent(QEvent.KeyRelease, Qt.Key_Return, Qt.NoModifier),
+            )
+
+
+# ############################################################################
+# ########## Functions ###########
+# ################################
+
+
+def load_session(path: str) -> List[dict]:
+    """Loads a recorded session
+    :param path: the session file path
+    """
+    with open(path, encoding="utf-8") as session_file:
+        return [json.loads(line) for line in session_file if line.strip()]
+
+
+def synthetic_project(
+    features: int, vertices: int, extent: QgsRectangle, seed: int = 0
+) -> QgsVectorLayer:
+    """Creates a memory layer of random polygons with many snappable vertices
+    :param features: number of polygons
+    :param vertices: number of vertices per polygon
+    :param extent: extent of the polygons
+    :param seed: random seed
+    """
+    rng = random.Random(seed)
+    layer = QgsVectorLayer(f"Polygon?crs={EPSG}", "Bâtiments", "memory")
+    feats = []
+    for _ in range(features):
+        center_x = rng.uniform(extent.xMinimum(), extent.xMaximum())
+        center_y = rng.uniform(extent.yMinimum(), extent.yMaximum())
+        radius = rng.uniform(2, 15)
+        ring = [
+            QgsPointXY(
+                center_x + radius * math.cos(2 * math.pi * i / vertices),
+                center_y + radius * math.sin(2 * math.pi * i / vertices),
+            )
+            for i in range(vertices)
+        ]
+        feat = QgsFeature()
+        feat.setGeometry(QgsGeometry.fromPolygonXY([ring]))
+        feats.append(feat)
+    layer.dataProvider().addFeatures(feats)
+    layer.updateExtents()
+    return layer
+
+
+def synthetic_session(
+    extent: QgsRectangle, moves: int = 500, seed: int = 0
+) -> List[dict]:
+    """Creates a session: a baseline capture, spinbox edits and Enter
+    :param extent: extent of the canvas
+    :param moves: number of mouse moves while drawing the baseline
+    :param seed: random seed
+    """
+    rng = random.Random(seed)
+    center = extent.center()
+    events = [{"type": "spin", "name": "distance_measured", "value": 25.0}]
+    events.append({"type": "spin", "name": "distance_one", "value": 12.5})
+    events.append({"type": "release", "x": center.x(), "y": center.y()})
+    for i in range(moves):
+        angle = 2 * math.pi * i / moves
+        events.append(
+            {
+                "type": "move",
+                "x": center.x() + 25 * math.cos(angle) + rng.uniform(-1, 1),
+                "y": center.y() + 25 * math.sin(angle) + rng.uniform(-1, 1),
+            }
+        )
+    events.append({"type": "release", "x": center.x() + 25, "y": center.y()})
+    for value in [1.0, 2.5, 5.0, 7.5]:
+        events.append({"type": "spin", "name": "distance_two", "value": value})
+        events.append({"type": "enter", "name": "distance_two"})
+    return events
+
+
+def report(latencies: Dict[str, List[float]], budget: float = FRAME_BUDGET_MS) -> str:
+    """Formats the latency distributions and the dropped frames by event type
+    :param latencies: the latencies in ms by event type
+    :param budget: the frame budget in ms
+    """
+    lines = [
+        f"{'event':<8} {'count':>6} {'mean':>8} {'p50':>8} {'p90':>8} "
+        f"{'p99':>8} {'max':>8} {'dropped':>8}"
+    ]
+    for event_type, values in sorted(latencies.items()):
+        ordered = sorted(values)
+        dropped = sum(max(0, math.ceil(value / budget) - 1) for value in values)
+        lines.append(
+            f"{event_type:<8} {len(values):>6} {statistics.mean(values):>8.2f} "
+            f"{_percentile(ordered, 50):>8.2f} {_percentile(ordered, 90):>8.2f} "
+            f"{_percentile(ordered, 99):>8.2f} {ordered[-1]:>8.2f} {dropped:>8}"
+        )
+    return "\n".join(lines)
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    index = min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1)
+    return ordered[max(index, 0)]
+
+
+def main(args: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1].strip())
+    parser.add_argument("session", nargs="?", help="recorded session file")
+    parser.add_argument("--features", type=int, default=2000)
+    parser.add_argument("--vertices", type=int, default=32)
+    parser.add_argument("--moves", type=int, default=500)
+    parser.add_argument("--json", help="write the latencies to this file")
+    options = parser.parse_args(args)
+
+    start_app()
+    iface = get_iface()
+    canvas = iface.mapCanvas()
+    canvas.resize(QSize(1280, 800))
+    project = QgsProject.instance()
+    project.setCrs(QgsCoordinateReferenceSystem(EPSG))
+    extent = QgsRectangle(2047000, 7277000, 2049000, 7279000)
+    layer = synthetic_project(options.features, options.vertices, extent)
+    project.addMapLayer(layer)
+    canvas.setDestinationCrs(project.crs())
+    canvas.setLayers([layer])
+    canvas.setExtent(extent)
+
+    config = QgsSnappingConfig(project)
+    config.setEnabled(True)
+    config.setMode(QgsSnappingConfig.AllLayers)
+    config.setTypeFlag(QgsSnappingConfig.VertexFlag)
+    config.setTolerance(12)
+    config.setUnits(QgsTolerance.Pixels)
+    project.setSnappingConfig(config)
+    canvas.snappingUtils().setConfig(config)
+
+    dock = CompasatedSquareDock(iface)
+    if options.session:
+        events = load_session(options.session)
+    else:
+        events = synthetic_session(canvas.extent(), options.moves)
+    latencies = InteractionReplayer(canvas, dock).replay(events)
+    print(report(latencies))
+    if options.json:
+        Path(options.json).write_text(json.dumps(latencies), encoding="utf-8")
+    dock.unload()
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    main()
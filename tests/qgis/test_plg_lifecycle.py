@@ -0,0 +1,130 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder, with an offscreen QGIS:
+
+    .. code-block:: bash
+        # for whole tests
+        QT_QPA_PLATFORM=offscreen python -m unittest tests.qgis.test_plg_lifecycle
+"""
+
+# standard library
+import gc
+import importlib.util
+import resource
+import unittest
+from pathlib import Path
+from unittest import mock
+
+if importlib.util.find_spec("qgis") is None:
+    raise unittest.SkipTest("qgis is not installed")
+
+# PyQGIS
+from qgis.core import QgsProject  # noqa: E402
+from qgis.PyQt.QtCore import QCoreApplication, QEvent, QObject  # noqa: E402
+from qgis.testing import start_app  # noqa: E402
+from qgis.testing.mocked import get_iface  # noqa: E402
+
+# project
+from equerre_compensee import classFactory  # noqa: E402
+from equerre_compensee.gui.widgets import (  # noqa: E402
+    CompasatedSquareDock,
+    CompensatedSquareTool,
+)
+
+start_app()
+
+# ############################################################################
+# ########## Functions ###########
+# ################################
+
+
+def rss_kb() -> int:
+    """Returns the current resident set size in kB"""
+    status = Path("/proc/self/status")
+    if status.is_file():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def process_deletions() -> None:
+    """Runs the pending deleteLater calls and the garbage collector"""
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    QCoreApplication.processEvents()
+    gc.collect()
+
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestPluginLifecycle(unittest.TestCase):
+
+    """Test loading and unloading the plugin"""
+
+    ITERATIONS = 50
+    RSS_TOLERANCE_KB = 4096
+
+    def setUp(self):
+        self.iface = get_iface()
+        self.canvas = self.iface.mapCanvas()
+
+    def load_unload(self) -> None:
+        """Loads the plugin, opens its dock and the map tool, then unloads it"""
+        plugin = classFactory(self.iface)
+        plugin.initGui()
+        plugin.run()
+        plugin.dockwidget.set_map_tool()
+        plugin.unload()
+        process_deletions()
+
+    def counts(self) -> dict:
+        """Counts the objects the plugin may leak"""
+        objects = gc.get_objects()
+        return {
+            "docks": sum(isinstance(o, CompasatedSquareDock) for o in objects),
+            "tools": sum(isinstance(o, CompensatedSquareTool) for o in objects),
+            "canvas_items": len(self.canvas.scene().items()),
+            "main_window_children": len(
+                self.iface.mainWindow().findChildren(QObject)
+            ),
+        }
+
+    def test_unload_removes_everything(self):
+        """Test that a single load and unload leaves nothing behind"""
+        before = self.counts()
+        self.load_unload()
+        self.assertEqual(self.counts(), before)
+
+    def test_unload_disconnects_project(self):
+        """Test that the project signals no longer reach an unloaded dock"""
+        with mock.patch.object(
+            CompasatedSquareDock, "crs_changed", autospec=True
+        ) as crs_changed:
+            self.load_unload()
+            QgsProject.instance().crsChanged.emit()
+        crs_changed.assert_not_called()
+
+    def test_stress_load_unload(self):
+        """Test that objects counts and RSS stay flat over many reloads"""
+        # warm up imports and caches
+        self.load_unload()
+        before = self.counts()
+        rss_before = rss_kb()
+
+        for _ in range(self.ITERATIONS):
+            self.load_unload()
+
+        self.assertEqual(self.counts(), before)
+        self.assertLess(rss_kb() - rss_before, self.RSS_TOLERANCE_KB)
+        self.assertIsNone(self.canvas.mapTool())
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.unit.test_core_baseline_search
+"""
+
+# standard library
+import unittest
+
+# project
+from equerre_compensee.core.baseline_search import GridIndex, find_baselines
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestBaselineSearch(unittest.TestCase):
+
+    """Test the baseline candidates search"""
+
+    def setUp(self):
+        self.index = GridIndex(
+            [(0, 0), (10, 0), (0, 10.02), (3, 4), (100, 100), (110.1, 100)], 10.1
+        )
+
+    def test_within(self):
+        """Test fixed-radius and ring queries."""
+        self.assertEqual(
+            sorted(index for index, _ in self.index.within((0, 0), 5)), [0, 3]
+        )
+        self.assertEqual(
+            sorted(index for index, _ in self.index.within((0, 0), 10.1, 9.9)),
+            [1, 2],
+        )
+
+    def test_find_baselines(self):
+        """Test candidates near the cursor are ranked by error."""
+        candidates = find_baselines(self.index, (0.5, 0), 1, 10, 0.05)
+        self.assertEqual(
+            [(candidate.start, candidate.end) for candidate in candidates],
+            [((0, 0), (10, 0)), ((0, 0), (0, 10.02))],
+        )
+        self.assertAlmostEqual(candidates[1].error, 0.02)
+
+    def test_find_baselines_out_of_tolerance(self):
+        """Test pairs out of tolerance or far from the cursor are ignored."""
+        self.assertEqual(find_baselines(self.index, (100, 100), 1, 10, 0.05), [])
+        self.assertEqual(find_baselines(self.index, (50, 50), 1, 10, 0.05), [])
+
+    def test_invalid_cell_size(self):
+        """Test the cell size must be positive."""
+        with self.assertRaises(ValueError):
+            GridIndex([], 0)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.unit.test_core_compensation
+"""
+
+# standard library
+import unittest
+
+# project
+from equerre_compensee.core.compensation import (
+    read_distances,
+    square_point,
+    square_points,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestCompensation(unittest.TestCase):
+
+    """Test the baseline compensation"""
+
+    def test_square_point(self):
+        """Test abscissa along the baseline and left hand ordinate."""
+        self.assertEqual(square_point((0, 0), (10, 0), 4, 2), (4, 2))
+        self.assertEqual(square_point((0, 0), (0, 10), 4, 2), (-2, 4))
+
+    def test_square_point_compensated(self):
+        """Test the abscissa is compensated, not the ordinate."""
+        # measured 20 for a real length of 10
+        self.assertEqual(square_point((0, 0), (10, 0), 4, 2, 20), (2, 2))
+
+    def test_square_point_degenerated(self):
+        """Test a baseline needs two distinct vertices."""
+        with self.assertRaises(ValueError):
+            square_point((1, 1), (1, 1), 4)
+
+    def test_square_points(self):
+        """Test batch compensation."""
+        self.assertEqual(
+            square_points((0, 0), (10, 0), [(4, 2), (10, -1)], 20),
+            [(2, 2), (5, -1)],
+        )
+
+    def test_read_distances(self):
+        """Test reading distances, with a header and decimal commas."""
+        lines = ["abscisse;ordonnée\n", "1,5;2\n", "\n", "3;\n"]
+        self.assertEqual(read_distances(lines), [(1.5, 2), (3, 0)])
+        self.assertEqual(read_distances(["1.5,2\n", "3,4\n"]), [(1.5, 2), (3, 4)])
+        self.assertEqual(read_distances([]), [])
+
+    def test_read_distances_delimiter(self):
+        """Test the delimiter isn't guessed from a decimal comma."""
+        self.assertEqual(
+            read_distances(["1,5;2,5\n", "3,25;4\n"]), [(1.5, 2.5), (3.25, 4)]
+        )
+        self.assertEqual(read_distances(["1,5;2\n", "3;4\n"]), [(1.5, 2), (3, 4)])
+        self.assertEqual(read_distances(["1,5\t2\n", "3\t4\n"]), [(1.5, 2), (3, 4)])
+
+    def test_read_distances_skipped(self):
+        """Test the rows that can't be read are reported, not the header."""
+        skipped = []
+        lines = ["abscisse;ordonnée\n", "1;2\n", "\n", "x;2\n", "3;4\n", "-;\n"]
+        self.assertEqual(read_distances(lines, skipped), [(1, 2), (3, 4)])
+        self.assertEqual(skipped, [4, 6])
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
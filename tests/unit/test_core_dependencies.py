@@ -0,0 +1,69 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.unit.test_core_dependencies
+"""
+
+# standard library
+import unittest
+
+# project
+from equerre_compensee.core.dependencies import DependencyIndex
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestDependencyIndex(unittest.TestCase):
+
+    """Test the baseline to points dependency index"""
+
+    def setUp(self):
+        self.index = DependencyIndex()
+        self.index.add(1, 10, 5, 1, 20)
+        self.index.add(2, 10, 10, 0, 20)
+        self.index.add(3, 11, 2)
+
+    def test_dependents(self):
+        """Test only the points of a baseline are returned."""
+        self.assertEqual(sorted(self.index.dependents(10)), [1, 2])
+        self.assertEqual(self.index.dependents(12), {})
+
+    def test_recompute(self):
+        """Test the points are recomputed on the new baseline."""
+        self.assertEqual(
+            self.index.recompute(10, [(0, 0), (0, 10)]),
+            {1: (-1, 2.5), 2: (0, 5)},
+        )
+        self.assertEqual(self.index.recompute(12, [(0, 0), (0, 10)]), {})
+
+    def test_recompute_scaled(self):
+        """Test the points are recomputed with their scale factor."""
+        self.index.add(4, 12, 5, 2, 0, 1.5)
+        self.assertEqual(self.index.recompute(12, [(0, 0), (10, 0)]), {4: (7.5, 3)})
+
+    def test_add_replaces(self):
+        """Test adding a point again moves it to its new baseline."""
+        self.index.add(1, 11, 3)
+        self.assertEqual(sorted(self.index.dependents(10)), [2])
+        self.assertEqual(sorted(self.index.dependents(11)), [1, 3])
+
+    def test_remove(self):
+        """Test removing points and baselines."""
+        self.index.remove(3)
+        self.index.remove(4)
+        self.assertNotIn(3, self.index)
+        self.index.remove_baseline(10)
+        self.assertEqual(len(self.index), 0)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
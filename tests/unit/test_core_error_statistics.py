@@ -0,0 +1,92 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.unit.test_core_error_statistics
+"""
+
+# standard library
+import statistics
+import unittest
+
+# project
+from equerre_compensee.core.error_statistics import ErrorStatistics, RunningStatistics
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestErrorStatistics(unittest.TestCase):
+
+    """Test the streaming error statistics"""
+
+    def test_running_statistics(self):
+        """Test Welford's mean and variance, with weights and merges."""
+        values = [1.5, 2.0, 2.0, 2.0, -3.25, 7.0]
+        running = RunningStatistics()
+        running.add(1.5)
+        running.add(2.0, weight=3)
+        other = RunningStatistics()
+        other.add(-3.25)
+        other.add(7.0)
+        running.merge(other)
+        self.assertEqual(running.count, 6)
+        self.assertAlmostEqual(running.mean, statistics.mean(values))
+        self.assertAlmostEqual(running.std, statistics.stdev(values))
+
+    def test_error_statistics(self):
+        """Test errors, maximum and share out of tolerance."""
+        stats = ErrorStatistics()
+        stats.add(10, 10.02, 0.05)
+        stats.add(20, 19.9, 0.05, weight=3)
+        stats.add(0, 5, 0.05)
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.points, 4)
+        self.assertAlmostEqual(stats.errors.mean, (0.02 - 0.1) / 2)
+        self.assertAlmostEqual(stats.max_error, 0.1)
+        self.assertEqual(stats.out_of_tolerance, 1)
+        self.assertAlmostEqual(stats.to_dict()["out_of_tolerance_share"], 0.5)
+
+    def test_repeated_measurement(self):
+        """Test a measurement counts once, however many points in a row it gives."""
+        stats = ErrorStatistics()
+        stats.add(10, 10.02, 0.05, weight=5)
+        self.assertEqual((stats.count, stats.points), (1, 5))
+        self.assertFalse(stats.drift_suspected())
+
+        for _ in range(5):
+            stats.add(20, 20.1, 0.05, key=1)
+        stats.add(20, 20.1, 0.05, weight=100, key=1)
+        self.assertEqual((stats.count, stats.points), (2, 110))
+        self.assertEqual(stats.out_of_tolerance, 1)
+        self.assertAlmostEqual(stats.out_of_tolerance_share, 0.5)
+        self.assertFalse(stats.drift_suspected())
+
+        # a new baseline, then the tool never comes back to the previous one
+        stats.add(30, 30, 0.05, key=2)
+        stats.add(30, 30, 0.05, key=2)
+        self.assertEqual((stats.count, stats.points), (3, 112))
+
+    def test_drift(self):
+        """Test a systematic scale difference is detected."""
+        stats = ErrorStatistics()
+        for measured in [10, 20, 30, 40, 50]:
+            stats.add(measured, measured * 1.25, 0.05)
+        self.assertAlmostEqual(stats.scale_drift, 0.25)
+        self.assertTrue(stats.drift_suspected())
+
+        stats = ErrorStatistics()
+        for measured, error in [(10, 0.01), (20, -0.02), (30, 0.01), (40, 0), (50, 0)]:
+            stats.add(measured, measured + error, 0.05)
+        self.assertFalse(stats.drift_suspected())
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
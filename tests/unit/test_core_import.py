@@ -0,0 +1,53 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.unit.test_core_import
+"""
+
+# standard library
+import subprocess
+import sys
+import unittest
+
+# project
+from equerre_compensee.core import tolerance_threshold
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestCoreImport(unittest.TestCase):
+
+    """Test the core package stands without QGIS nor Qt"""
+
+    def test_no_qgis_nor_qt(self):
+        """Test importing core doesn't import QGIS or Qt."""
+        script = (
+            "import sys, equerre_compensee.core; "
+            "print(sorted(name for name in sys.modules "
+            "if name.split('.')[0] in ('qgis', 'PyQt5', 'PyQt6', 'sip')))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        self.assertEqual(output.strip(), "[]")
+
+    def test_tolerance_threshold(self):
+        """Test the tolerance formula."""
+        self.assertAlmostEqual(tolerance_threshold(0), 0.03)
+        self.assertAlmostEqual(tolerance_threshold(100), 0.18)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
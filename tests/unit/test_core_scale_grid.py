@@ -0,0 +1,68 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.unit.test_core_scale_grid
+"""
+
+# standard library
+import unittest
+
+# project
+from equerre_compensee.core.scale_grid import ScaleGrid, elevation_factor
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestScaleGrid(unittest.TestCase):
+
+    """Test the scale factor grid"""
+
+    def setUp(self):
+        # a linear scale factor is exactly interpolated
+        self.grid = ScaleGrid.build(
+            5, 5, 35, 25, 10, lambda x, y: 1 + 1e-5 * x - 2e-5 * y
+        )
+
+    def test_build(self):
+        """Test the nodes are aligned on the step and cover the extent."""
+        self.assertEqual((self.grid.x_min, self.grid.y_min), (0, 0))
+        self.assertEqual((self.grid.x_max, self.grid.y_max), (40, 30))
+        self.assertTrue(self.grid.contains(5, 5, 35, 25))
+        self.assertFalse(self.grid.contains(5, 5, 45, 25))
+
+    def test_factor(self):
+        """Test bilinear interpolation and clamping."""
+        self.assertAlmostEqual(self.grid.factor(17, 23), 1 + 17e-5 - 46e-5)
+        self.assertAlmostEqual(self.grid.factor(40, 30), 1 + 40e-5 - 60e-5)
+        self.assertAlmostEqual(self.grid.factor(-10, 50), 1 - 60e-5)
+
+    def test_ground_to_grid(self):
+        """Test the conversion both ways, with the elevation reduction."""
+        grid_distance = self.grid.ground_to_grid(100, 20, 10, 200)
+        self.assertAlmostEqual(
+            grid_distance, 100 * (1 + 20e-5 - 20e-5) * elevation_factor(200)
+        )
+        self.assertAlmostEqual(
+            self.grid.grid_to_ground(grid_distance, 20, 10, 200), 100
+        )
+        self.assertLess(elevation_factor(200), 1)
+
+    def test_invalid(self):
+        """Test a grid needs a positive step and two nodes by axis."""
+        with self.assertRaises(ValueError):
+            ScaleGrid(0, 0, 0, [[1, 1], [1, 1]])
+        with self.assertRaises(ValueError):
+            ScaleGrid(0, 0, 1, [[1, 1]])
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
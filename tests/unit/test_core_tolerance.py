@@ -0,0 +1,131 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.unit.test_core_tolerance
+"""
+
+# standard library
+import importlib.util
+import unittest
+
+# project
+from equerre_compensee.core.tolerance import (
+    DEFAULT_TOLERANCE_MODEL,
+    TOLERANCE_MODELS,
+    TableModel,
+    ToleranceModel,
+    register_tolerance_model,
+    tolerance_model,
+    tolerance_threshold,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestToleranceModels(unittest.TestCase):
+
+    """Test the tolerance models and their registry"""
+
+    def setUp(self):
+        self.table = TableModel("test", "Test", [10, 20, 40], [0.05, 0.07, 0.1])
+
+    def tearDown(self):
+        TOLERANCE_MODELS.pop("test", None)
+
+    def test_default_model(self):
+        """Test the default model is the historical formula."""
+        model = tolerance_model()
+        self.assertEqual(model.name, DEFAULT_TOLERANCE_MODEL)
+        self.assertAlmostEqual(model(100), tolerance_threshold(100))
+        self.assertAlmostEqual(model(100), 0.18)
+
+    def test_evaluate(self):
+        """Test array evaluation matches scalar evaluation."""
+        for model in [tolerance_model(), self.table]:
+            distances = [0, 5, 10, 15, 30, 100]
+            for tolerance, distance in zip(model.evaluate(distances), distances):
+                self.assertAlmostEqual(float(tolerance), model(distance))
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_evaluate_numpy(self):
+        """Test vectorized evaluation matches scalar evaluation."""
+        import numpy
+
+        distances = numpy.linspace(0, 200, 101)
+        for model in [tolerance_model(), self.table]:
+            tolerances = model.evaluate(distances)
+            self.assertIsInstance(tolerances, numpy.ndarray)
+            numpy.testing.assert_allclose(
+                tolerances, [model(float(distance)) for distance in distances]
+            )
+        self.assertEqual(
+            self.table.within([10, 20, 30], [10.04, 20.08, 30]).tolist(),
+            [True, False, True],
+        )
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_evaluate_numpy_base(self):
+        """Test a model without vectorized evaluation still returns an array."""
+        import numpy
+
+        class HalfModel(ToleranceModel):
+            def __call__(self, distance: float) -> float:
+                return distance / 2
+
+        tolerances = HalfModel("half", "Half").evaluate([2, 5])
+        self.assertIsInstance(tolerances, numpy.ndarray)
+        self.assertEqual(tolerances.tolist(), [1, 2.5])
+
+    def test_abstract_model(self):
+        """Test a model must implement its evaluation."""
+        with self.assertRaises(TypeError):
+            ToleranceModel("test", "Test")
+
+    def test_table(self):
+        """Test table interpolation, constant beyond the table."""
+        self.assertAlmostEqual(self.table(5), 0.05)
+        self.assertAlmostEqual(self.table(15), 0.06)
+        self.assertAlmostEqual(self.table(30), 0.085)
+        self.assertAlmostEqual(self.table(50), 0.1)
+
+    def test_table_from_lines(self):
+        """Test reading a table, with a header and decimal commas."""
+        table = TableModel.from_lines(
+            "test", "Test", ["distance;tolérance\n", "20;0,07\n", "10;0,05\n"]
+        )
+        self.assertEqual(table.distances, [10, 20])
+        self.assertAlmostEqual(table(15), 0.06)
+
+    def test_table_invalid(self):
+        """Test a table needs increasing distances with tolerances."""
+        with self.assertRaises(ValueError):
+            TableModel("test", "Test", [10, 10], [0.1, 0.2])
+        with self.assertRaises(ValueError):
+            TableModel("test", "Test", [], [])
+
+    def test_within(self):
+        """Test checking many measurements at once."""
+        self.assertEqual(
+            [bool(ok) for ok in self.table.within([10, 20, 30], [10.04, 20.08, 30])],
+            [True, False, True],
+        )
+
+    def test_registry(self):
+        """Test registering and getting a model."""
+        register_tolerance_model(self.table)
+        self.assertIs(tolerance_model("test"), self.table)
+        with self.assertRaises(KeyError):
+            tolerance_model("unknown")
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.unit.test_core_traverse
+"""
+
+# standard library
+import unittest
+
+# project
+from equerre_compensee.core.traverse import Traverse
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestTraverse(unittest.TestCase):
+
+    """Test the traverse compensation"""
+
+    def setUp(self):
+        # an L shaped traverse, 10 east then 20 north
+        self.traverse = Traverse([(0, 0), (10, 0), (10, 0), (10, 20)])
+
+    def test_chainages(self):
+        """Test cumulative lengths, duplicated vertices are ignored."""
+        self.assertEqual(self.traverse.chainages, [0, 10, 30])
+        self.assertEqual(self.traverse.length, 30)
+
+    def test_segment_index(self):
+        """Test the binary search of the segment of a chainage."""
+        self.assertEqual(self.traverse.segment_index(-5), 0)
+        self.assertEqual(self.traverse.segment_index(5), 0)
+        self.assertEqual(self.traverse.segment_index(10), 1)
+        self.assertEqual(self.traverse.segment_index(45), 1)
+
+    def test_point_at(self):
+        """Test chainage and left hand offset."""
+        self.assertEqual(self.traverse.point_at(5, 2), (5, 2))
+        self.assertEqual(self.traverse.point_at(15, 2), (8, 5))
+
+    def test_point_at_compensated(self):
+        """Test the chainage is compensated, not the offset."""
+        # measured 60 for a real length of 30
+        self.assertEqual(self.traverse.point_at(30, 1, 60), (9, 5))
+
+    def test_reversed(self):
+        """Test the traverse from its last vertex."""
+        self.assertEqual(self.traverse.reversed().point_at(20), (10, 0))
+
+    def test_rotated(self):
+        """Test a ring starts from its vertex nearest to a point."""
+        ring = Traverse([(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)])
+        self.assertTrue(ring.is_closed)
+        self.assertFalse(self.traverse.is_closed)
+        index = ring.nearest_vertex((9, 11))
+        self.assertEqual(index, 2)
+        rotated = ring.rotated(index)
+        self.assertEqual(rotated.vertices[0], (10, 10))
+        self.assertEqual(rotated.vertices[-1], (10, 10))
+        self.assertEqual(rotated.length, 40)
+        self.assertEqual(rotated.point_at(5), (5, 10))
+        with self.assertRaises(ValueError):
+            self.traverse.rotated(1)
+
+    def test_too_short(self):
+        """Test a traverse needs two distinct vertices."""
+        with self.assertRaises(ValueError):
+            Traverse([(1, 1), (1, 1)])
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()